@@ -0,0 +1,41 @@
+import copy
+import random
+
+import pytest
+
+from gobot.go.go import GoGame
+
+
+@pytest.fixture(scope="module")
+def mid_game() -> GoGame:
+    """A 19x19 game after 200 random legal moves"""
+    game = GoGame(19, 19)
+    rng = random.Random(0)
+    for move in range(200):
+        color = ["black", "white"][move % 2]
+        legal = game.legal_moves(color)
+        game.place_stone(*divmod(rng.choice([point for point in range(361) if legal & (1 << point)]), 19), color)
+    return game
+
+
+def free_point(game: GoGame) -> tuple[int, int]:
+    legal = game.legal_moves("black")
+    return divmod((legal & -legal).bit_length() - 1, 19)
+
+
+def test_fork_and_move(benchmark, mid_game):
+    x, y = free_point(mid_game)
+
+    def fork_and_move():
+        mid_game.fork().place_stone(x, y, "black")
+
+    benchmark(fork_and_move)
+
+
+def test_deepcopy_and_move(benchmark, mid_game):
+    x, y = free_point(mid_game)
+
+    def deepcopy_and_move():
+        copy.deepcopy(mid_game).place_stone(x, y, "black")
+
+    benchmark(deepcopy_and_move)
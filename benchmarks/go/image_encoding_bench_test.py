@@ -0,0 +1,31 @@
+import random
+
+import pytest
+
+from gobot.go.go import GoGame
+from gobot.go.goscreenshot import ImageEncoding, ImageFormat, board_template, take_in_memory_screenshot
+from gobot.go.playout import random_playout
+
+ENCODINGS = {
+    "jpeg": ImageEncoding(),
+    "jpeg_q60": ImageEncoding(quality=60),
+    "jpeg_600px": ImageEncoding(resolutions={9: 600, 13: 600, 19: 600}),
+    "jpeg_q60_480px": ImageEncoding(quality=60, resolutions={9: 480, 13: 480, 19: 480}),
+    "png": ImageEncoding(ImageFormat.PNG),
+    "png_64_colors": ImageEncoding(ImageFormat.PNG, palette_colors=64),
+    "webp": ImageEncoding(ImageFormat.WEBP),
+    "webp_q60_600px": ImageEncoding(ImageFormat.WEBP, quality=60, resolutions={9: 600, 13: 600, 19: 600}),
+}
+
+
+@pytest.mark.parametrize("size", [9, 19])
+@pytest.mark.parametrize("encoding", ENCODINGS.values(), ids=ENCODINGS.keys())
+def test_encoded_screenshot(benchmark, encoding, size):
+    """Rendering and encoding a board covered about halfway with stones, with the payload size to upload in the extra info"""
+    game = GoGame(size, size)
+    random_playout(game, "black", random.Random(0), max_moves=size * size // 2)
+    board_template(size, encoding.resolutions.get(size))
+
+    payload = benchmark(take_in_memory_screenshot, game, None, encoding)
+
+    benchmark.extra_info["bytes"] = payload.getbuffer().nbytes
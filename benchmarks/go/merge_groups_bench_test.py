@@ -0,0 +1,37 @@
+from gobot.go.go import GoGame
+
+CHAIN_LENGTH = 150
+
+
+def two_chains() -> GoGame:
+    """
+    Two black chains of 150 stones each on 19x19, filling columns a-h and k-r,
+    with a bridge stone on column i so that a single stone on j joins them.
+    """
+    game = GoGame(19, 19)
+    for i in range(CHAIN_LENGTH):
+        game.place_stone(*divmod(i, 19), "black")
+        game.place_stone(*divmod(10 * 19 + i, 19), "black")
+    game.place_stone(8, 0, "black")
+    return game
+
+
+def test_join_two_150_stone_chains(benchmark):
+    def setup():
+        return (two_chains(), 9, 0, "black"), {}
+
+    benchmark.pedantic(GoGame.place_stone, setup=setup, rounds=200)
+
+
+def test_capture_150_stone_chain(benchmark):
+    def setup():
+        game = GoGame(19, 19)
+        for i in range(CHAIN_LENGTH):
+            game.place_stone(*divmod(i, 19), "black")
+        for y in range(17, 19):
+            game.place_stone(7, y, "white")
+        for y in range(16):
+            game.place_stone(8, y, "white")
+        return (game, 8, 16, "white"), {}
+
+    benchmark.pedantic(GoGame.place_stone, setup=setup, rounds=200)
@@ -0,0 +1,44 @@
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+from gobot.go.go import GoGame
+from gobot.go.mcts import MCTS
+
+VISITS = 1200
+WORKER_COUNTS = sorted({1, 2, 4, os.cpu_count() or 1})
+
+# seconds per search with a single process, filled by the first parametrization
+_single_process_seconds: list[float] = []
+
+
+@pytest.fixture(scope="module")
+def executor():
+    with ProcessPoolExecutor(max_workers=max(WORKER_COUNTS) - 1) as executor:
+        yield executor
+
+
+@pytest.mark.parametrize("processes", WORKER_COUNTS)
+def test_parallel_search_scaling(benchmark, executor, processes):
+    """
+    A fixed number of visits on 9x9 split across `processes` (the calling one included).
+    Scaling efficiency is the single-process time divided by `processes` times this time.
+    """
+    game = GoGame(9, 9)
+    search = MCTS(rng=random.Random(0))
+
+    def run():
+        search.root = None
+        search.parallel_search(game, "black", seconds=60, executor=executor, workers=processes - 1, max_visits=VISITS)
+
+    benchmark.pedantic(run, rounds=3, warmup_rounds=1)
+    if not benchmark.stats:
+        return
+    seconds = benchmark.stats.stats.mean
+    benchmark.extra_info["visits_per_second"] = VISITS / seconds
+    if processes == 1:
+        _single_process_seconds.append(seconds)
+    elif _single_process_seconds:
+        benchmark.extra_info["scaling_efficiency"] = _single_process_seconds[0] / (processes * seconds)
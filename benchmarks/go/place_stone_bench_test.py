@@ -0,0 +1,33 @@
+import random
+
+from gobot.go.go import GoGame
+from gobot.go.playout import random_playout
+
+
+def test_place_stone_midgame(benchmark):
+    """Every legal black move of a 19x19 game after 150 random moves, each taken back again"""
+    game = GoGame(19, 19)
+    random_playout(game, "black", random.Random(0), max_moves=150)
+    coords = [(x, y) for x in range(19) for y in range(19) if game.is_legal(x, y, "black")]
+
+    def place_all():
+        for coord in coords:
+            game.place_stone(*coord, "black")
+            game.undo()
+
+    benchmark(place_all)
+    benchmark.extra_info["moves"] = len(coords)
+
+
+def test_place_stone_capture_heavy(benchmark):
+    """A black stone on the first line capturing the two white strings of nine stones on either side"""
+
+    def setup():
+        stones: dict[tuple[int, int], str] = {}
+        for x in range(19):
+            stones[(x, 1)] = "black"
+            if x != 9:
+                stones[(x, 0)] = "white"
+        return (GoGame.from_position(19, 19, stones), 9, 0, "black"), {}
+
+    benchmark.pedantic(GoGame.place_stone, setup=setup, rounds=200)
@@ -0,0 +1,20 @@
+import random
+
+import pytest
+
+from gobot.go.go import GoGame
+from gobot.go.playout import random_playout
+
+
+@pytest.mark.parametrize("size", [9, 13, 19])
+def test_random_playouts(benchmark, size):
+    """Full random games from the empty board, the OPS column reads as playouts per second"""
+    rng = random.Random(0)
+    game = GoGame(size, size)
+
+    def playout():
+        random_playout(game.fork(), "black", rng)
+
+    benchmark.pedantic(playout, rounds=20 if size == 19 else 50, warmup_rounds=1)
+    if benchmark.stats:
+        benchmark.extra_info["playouts_per_second"] = 1 / benchmark.stats.stats.mean
@@ -0,0 +1,37 @@
+import random
+
+import pytest
+
+from gobot.go.go import GoGame
+from gobot.go.goscreenshot import take_in_memory_screenshot, take_screenshot
+from gobot.go.playout import random_playout
+
+
+@pytest.mark.parametrize("size", [9, 13, 19])
+def test_take_in_memory_screenshot(benchmark, size):
+    """Rendering and encoding a board covered about halfway with stones"""
+    game = GoGame(size, size)
+    random_playout(game, "black", random.Random(0), max_moves=size * size // 2)
+    benchmark(take_in_memory_screenshot, game)
+
+
+@pytest.mark.parametrize("size", [9, 13, 19])
+def test_take_screenshot(benchmark, size):
+    """Rendering without a previous frame, drawing every stone"""
+    game = GoGame(size, size)
+    random_playout(game, "black", random.Random(0), max_moves=size * size // 2)
+    benchmark(take_screenshot, game)
+
+
+@pytest.mark.parametrize("size", [9, 13, 19])
+def test_take_screenshot_after_move(benchmark, size):
+    """Rendering the next move of the same game, starting from the previous frame"""
+    game = GoGame(size, size)
+    random_playout(game, "black", random.Random(0), max_moves=size * size // 2)
+    x, y = next((x, y) for x in range(size) for y in range(size) if game.is_legal(x, y, "black"))
+
+    def setup():
+        take_screenshot(game, key="benchmark")
+        game.place_stone(x, y, "black")
+
+    benchmark.pedantic(take_screenshot, args=(game, "benchmark"), setup=setup, teardown=lambda *args: game.undo(), rounds=100)
@@ -0,0 +1,44 @@
+import io
+import os
+import random
+
+import pytest
+
+from gobot.go.go import GoGame
+from gobot.go.playout import random_playout
+from gobot.go.sgf import read_sgf, write_sgf
+
+# path of an SGF collection to replay instead of generated games, e.g. a professional game archive
+COLLECTION = os.environ.get("SGF_COLLECTION")
+
+
+@pytest.fixture(scope="module")
+def collection() -> str:
+    if COLLECTION:
+        with open(COLLECTION, encoding="utf-8", errors="replace") as file:
+            return file.read()
+    rng = random.Random(0)
+    records = io.StringIO()
+    for _ in range(20):
+        game = GoGame(19, 19)
+        random_playout(game, "black", rng, max_moves=250)
+        write_sgf(game, records)
+    return records.getvalue()
+
+
+def test_parse_collection(benchmark, collection):
+    def parse() -> int:
+        return sum(1 for game in read_sgf(io.StringIO(collection)) for _ in game.moves)
+
+    moves = benchmark(parse)
+    if benchmark.stats:
+        benchmark.extra_info["moves_per_second"] = moves / benchmark.stats.stats.mean
+
+
+def test_replay_collection(benchmark, collection):
+    def replay() -> int:
+        return sum(len(game.replay().undo_stack) for game in read_sgf(io.StringIO(collection)))
+
+    moves = benchmark(replay)
+    if benchmark.stats:
+        benchmark.extra_info["moves_per_second"] = moves / benchmark.stats.stats.mean
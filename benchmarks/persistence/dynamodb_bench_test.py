@@ -0,0 +1,38 @@
+import random
+
+import pytest
+
+from gobot.go.go import GoGame
+from gobot.go.playout import random_playout
+from gobot.persistence.dynamodb import to_db_format, to_domain
+from gobot.telegram.telegram_go_game import TelegramGoGame
+
+POSITIONS = [(9, 40), (19, 200)]
+
+
+def stored_game(size: int, moves: int) -> TelegramGoGame:
+    """A game of two players after `moves` random moves, as it is saved after every move"""
+    played = GoGame(size, size)
+    random_playout(played, "black", random.Random(0), max_moves=moves)
+    game = TelegramGoGame(chat_id=123456, board_x=size, board_y=size)
+    game.add_player(111, "Player1")
+    game.add_player(222, "Player2")
+    game.load_position({(x, y): color for x in range(size) for y in range(size) if (color := played.color_at(x, y))})
+    game.load_history(played.history_bytes())
+    return game
+
+
+@pytest.mark.parametrize("size, moves", POSITIONS)
+def test_to_db_format(benchmark, size, moves):
+    benchmark(to_db_format, stored_game(size, moves))
+
+
+@pytest.mark.parametrize("size, moves", POSITIONS)
+def test_to_domain(benchmark, size, moves):
+    benchmark(to_domain, to_db_format(stored_game(size, moves)))
+
+
+@pytest.mark.parametrize("size, moves", POSITIONS)
+def test_round_trip(benchmark, size, moves):
+    game = stored_game(size, moves)
+    benchmark(lambda: to_domain(to_db_format(game)))
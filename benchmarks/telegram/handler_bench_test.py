@@ -0,0 +1,99 @@
+import asyncio
+import json
+import random
+import time
+from typing import Any
+from unittest.mock import patch
+
+import pytest
+from telegram import User
+from telegram.ext import ExtBot
+
+import main
+from gobot import settings
+from gobot.go.go import GoGame
+from gobot.go.playout import random_playout
+from gobot.persistence import persistence_factory
+from gobot.persistence.dynamodb import to_db_format
+from gobot.telegram.telegram_go_game import TelegramGoGame
+from tests.fake_db import FakeDB
+
+CHAT_ID = 123456
+WHITE_ID = 111
+BLACK_ID = 222
+
+
+def place_event(coord: str) -> dict[str, Any]:
+    """A webhook event of black sending `/place <coord>`"""
+    message = {
+        "message_id": 1,
+        "from": {"id": BLACK_ID, "first_name": "Black", "is_bot": False, "username": "black"},
+        "chat": {"id": CHAT_ID, "type": "group"},
+        "date": time.time(),
+        "text": f"/place {coord}",
+        "entities": [{"type": "bot_command", "offset": 0, "length": len("/place")}],
+    }
+    return {"body": json.dumps({"update_id": 1, "message": message})}
+
+
+@pytest.fixture
+def fake_bot():
+    """No requests to Telegram: the bot user is made up and everything sent is recorded"""
+    sent: list[str] = []
+    me = User(id=1, first_name="Go Sensei", is_bot=True, username="go_sensei_bot")
+
+    async def get_me(self, *args, **kwargs):
+        self._bot_user = me
+        return me
+
+    async def send_message(self, *args, **kwargs):
+        sent.append("message")
+
+    async def send_photo(self, *args, **kwargs):
+        sent.append("photo")
+
+    async def send_document(self, *args, **kwargs):
+        sent.append("document")
+
+    with (
+        patch.object(settings, "_settings", settings.Settings(TOKEN="123456:fake")),
+        patch.object(ExtBot, "get_me", get_me),
+        patch.object(ExtBot, "send_message", send_message),
+        patch.object(ExtBot, "send_photo", send_photo),
+        patch.object(ExtBot, "send_document", send_document),
+    ):
+        yield sent
+
+
+@pytest.fixture
+def fake_db():
+    db = FakeDB()
+    with patch.object(persistence_factory, "get_db_adapter", lambda: db):
+        yield db
+
+
+def test_place_command_19x19(benchmark, fake_bot, fake_db):
+    """A /place update from parsing the webhook body to the board image being sent, on a 19x19 game after 150 moves"""
+    played = GoGame(19, 19)
+    random_playout(played, "black", random.Random(0), max_moves=150)
+    game = TelegramGoGame(chat_id=CHAT_ID, board_x=19, board_y=19)
+    game.add_player(WHITE_ID, "white")
+    game.add_player(BLACK_ID, "black")
+    game.load_position({(x, y): color for x in range(19) for y in range(19) if (color := played.color_at(x, y))})
+    game.load_history(played.history_bytes())
+    # the history is replayed whatever the turn was, so make it black's turn explicitly
+    game.current_player_index = 1
+    x, y = next((x, y) for x in range(19) for y in range(19) if game.is_legal(x, y, "black"))
+    stored = to_db_format(game)
+    event = place_event(GoGame.to_str_coord(x, y))
+
+    application = main.setup_app()
+
+    def setup():
+        fake_db.items[CHAT_ID] = dict(stored)
+        fake_bot.clear()
+
+    response = benchmark.pedantic(lambda: asyncio.run(main.async_handler(event, application)), setup=setup, rounds=30, warmup_rounds=1)
+
+    assert response == {"statusCode": 200, "body": "Success"}
+    assert fake_bot == ["photo", "message"]
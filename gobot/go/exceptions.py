@@ -26,3 +26,18 @@ class InvalidBoardSizeException(GoGameException):
 class KoException(GoGameException):
     def __init__(self, message):
         super(KoException, self).__init__(message)
+
+
+class NothingToUndoException(GoGameException):
+    def __init__(self, message):
+        super(NothingToUndoException, self).__init__(message)
+
+
+class NothingToRedoException(GoGameException):
+    def __init__(self, message):
+        super(NothingToRedoException, self).__init__(message)
+
+
+class SgfException(GoGameException):
+    def __init__(self, message):
+        super(SgfException, self).__init__(message)
@@ -1,103 +1,870 @@
+import struct
+import sys
+from array import array
+from collections.abc import Iterator, Sequence
+from dataclasses import dataclass
+from enum import StrEnum
+from typing import overload
+
 from gobot.go import strings
-from gobot.go.exceptions import CoordOccupiedException, InvalidBoardSizeException, InvalidCoordinateException, KoException, SelfCaptureException
+from gobot.go.exceptions import (
+    CoordOccupiedException,
+    InvalidBoardSizeException,
+    InvalidCoordinateException,
+    KoException,
+    NothingToRedoException,
+    NothingToUndoException,
+    SelfCaptureException,
+)
+from gobot.go.zobrist import ZobristKeys, zobrist_keys
 
 REVERSE: dict[str, str] = {"white": "black", "black": "white"}
 
+# stones are stored as small integers in a flat array, one byte per intersection
+EMPTY = 0
+BLACK = 1
+WHITE = 2
+COLOR_CODES: dict[str, int] = {"black": BLACK, "white": WHITE}
+COLOR_NAMES: tuple[str | None, ...] = (None, "black", "white")
+SUPPORTED_SIZES: tuple[tuple[int, int], ...] = ((9, 9), (13, 13), (19, 19))
+DEFAULT_KOMI = 7.5
+
+# header of `GoGame.to_bytes()`: size_x, size_y, ko rule, last stone placed, last captured single stone
+_BYTES_HEADER = struct.Struct("<BBBHH")
+_NO_POINT = 0xFFFF
+
+# `GoGame.history` holds `point << 2 | color` per move, followed by `point << 2 | CAPTURED` for every captured
+# stone, a pass being a move on the point just past the board
+CAPTURED = 3
+
+
+class KoRule(StrEnum):
+    SIMPLE = "simple"
+    POSITIONAL_SUPERKO = "positional_superko"
+    SITUATIONAL_SUPERKO = "situational_superko"
+
+
+class Group:
+    """
+    A chain of connected stones of one color, stored at the root point of its union-find tree.
+    Groups may be shared between forked games and are only changed in place by the game owning them.
+    """
+
+    __slots__ = ("color", "size", "liberties", "owner")
+
+    def __init__(self, color: int, size: int, liberties: set[int], owner: object) -> None:
+        self.color: int = color
+        self.size: int = size
+        self.liberties: set[int] = liberties
+        self.owner: object = owner
+
+
+@dataclass(frozen=True)
+class GameResult:
+    """Area scores of both players, white's including komi"""
+
+    black: float
+    white: float
+    komi: float
+
+    @property
+    def winner(self) -> str | None:
+        if self.black == self.white:
+            return None
+        return "black" if self.black > self.white else "white"
+
+    @property
+    def margin(self) -> float:
+        return abs(self.black - self.white)
+
+
+class Move:
+    """A placed stone (or a pass, without coord) together with what is needed to take it back"""
+
+    __slots__ = ("coord", "color", "captured", "last_stone_placed", "last_captured_single_stone")
+
+    def __init__(
+        self,
+        coord: tuple[int, int] | None,
+        color: str,
+        captured: list[tuple[int, int]],
+        last_stone_placed: tuple[int, int] | None,
+        last_captured_single_stone: tuple[int, int] | None,
+    ) -> None:
+        self.coord = coord
+        self.color = color
+        self.captured = captured
+        # ko state before the move
+        self.last_stone_placed = last_stone_placed
+        self.last_captured_single_stone = last_captured_single_stone
+
+
+class MoveStack(Sequence[Move]):
+    """
+    The moves of a game's `history` as a read-only sequence, oldest first. Moves are decoded when they are
+    accessed, the last one without walking the whole history, so loading a game creates no Move objects.
+    """
+
+    __slots__ = ("_game",)
+
+    def __init__(self, game: "GoGame") -> None:
+        self._game = game
+
+    def __len__(self) -> int:
+        return sum(1 for entry in self._game.history if entry & 3 != CAPTURED)
+
+    def __bool__(self) -> bool:
+        return bool(self._game.history)
+
+    def __iter__(self) -> Iterator[Move]:
+        return self._game.moves()
+
+    def __reversed__(self) -> Iterator[Move]:
+        end = len(self._game.history)
+        while end:
+            move, end = self._game._decode_move(end)
+            yield move
+
+    @overload
+    def __getitem__(self, index: int) -> Move: ...
+    @overload
+    def __getitem__(self, index: slice) -> list[Move]: ...
+    def __getitem__(self, index: int | slice) -> Move | list[Move]:
+        if isinstance(index, slice):
+            return list(self)[index]
+        if index < 0:
+            for i, move in enumerate(reversed(self), 1):
+                if i == -index:
+                    return move
+        else:
+            for i, move in enumerate(self):
+                if i == index:
+                    return move
+        raise IndexError("move index out of range")
+
 
 class GridPosition:
-    def __init__(self) -> None:
-        self.group: set[tuple[int, int]] = set()
-        self.color: str | None = None
+    """Read-only view of a single intersection of a GoGame board"""
+
+    __slots__ = ("_game", "_point", "color")
+
+    def __init__(self, game: "GoGame | None" = None, point: int = 0) -> None:
+        self._game = game
+        self._point = point
+        self.color: str | None = None if game is None else COLOR_NAMES[game._colors[point]]
 
     @property
     def is_free(self) -> bool:
         return self.color is None
 
-    def clear(self) -> None:
-        self.group = set()
-        self.color = None
+    @property
+    def group(self) -> set[tuple[int, int]]:
+        if self._game is None or self.color is None:
+            return set()
+        return {self._game._to_coord(stone) for stone in self._game._group_stones(self._point)}
+
+    @property
+    def liberties(self) -> set[tuple[int, int]]:
+        if self._game is None or self.color is None:
+            return set()
+        group = self._game._groups[self._game._find(self._point)]
+        return {self._game._to_coord(liberty) for liberty in group.liberties}
+
+
+class BoardColumn:
+    """Column `x` of the board, indexable by `y`"""
+
+    __slots__ = ("_game", "_offset")
+
+    def __init__(self, game: "GoGame", x: int) -> None:
+        self._game = game
+        self._offset = x * game.size_y
+
+    def __len__(self) -> int:
+        return self._game.size_y
+
+    def __getitem__(self, y: int) -> GridPosition:
+        if not 0 <= y < self._game.size_y:
+            raise IndexError(y)
+        return GridPosition(self._game, self._offset + y)
+
+    def __iter__(self) -> Iterator[GridPosition]:
+        for y in range(self._game.size_y):
+            yield GridPosition(self._game, self._offset + y)
+
+
+class Board:
+    """Keeps the `board[x][y]` access of the former nested-list board on top of the flat array"""
+
+    __slots__ = ("_game",)
+
+    def __init__(self, game: "GoGame") -> None:
+        self._game = game
+
+    def __len__(self) -> int:
+        return self._game.size_x
+
+    def __getitem__(self, x: int) -> BoardColumn:
+        if not 0 <= x < self._game.size_x:
+            raise IndexError(x)
+        return BoardColumn(self._game, x)
+
+    def __iter__(self) -> Iterator[BoardColumn]:
+        for x in range(self._game.size_x):
+            yield BoardColumn(self._game, x)
+
+
+def _neighbor_table(size_x: int, size_y: int) -> tuple[tuple[int, ...], ...]:
+    """For every point index, the indices of its orthogonal neighbors"""
+    table: list[tuple[int, ...]] = []
+    for x in range(size_x):
+        for y in range(size_y):
+            neighbors: list[int] = []
+            if x > 0:
+                neighbors.append((x - 1) * size_y + y)
+            if x < size_x - 1:
+                neighbors.append((x + 1) * size_y + y)
+            if y > 0:
+                neighbors.append(x * size_y + y - 1)
+            if y < size_y - 1:
+                neighbors.append(x * size_y + y + 1)
+            table.append(tuple(neighbors))
+    return tuple(table)
+
+
+# computed once at import and shared by every game of the same size
+NEIGHBOR_TABLES: dict[tuple[int, int], tuple[tuple[int, ...], ...]] = {size: _neighbor_table(*size) for size in SUPPORTED_SIZES}
+ZOBRIST_KEYS: dict[tuple[int, int], ZobristKeys] = {size: zobrist_keys(*size) for size in SUPPORTED_SIZES}
 
 
 class GoGame:
-    def __init__(self, size_x: int = 9, size_y: int = 9) -> None:
+    """
+    Go rules engine.
+
+    The board is a flat `bytearray` indexed by `x * size_y + y` holding EMPTY, BLACK or WHITE,
+    and each point's neighbors are looked up in a table shared by all games of the same size.
+    Stones are joined into groups with a union-find (path compression, union by size) whose roots
+    hold a Group with the liberties, updated incrementally on each move, so atari, capture and
+    self-capture checks never have to walk a group. The stones of a group are additionally linked
+    in a ring through `_next_stone`, which lets two groups be merged by swapping two pointers.
+
+    The Zobrist hash of the position is updated with every placed and captured stone, and the hashes
+    of all past positions are kept, so the superko rules are a single set lookup per move (the set is
+    only built once a superko rule is first checked).
+
+    Every placed stone and pass is packed into `history`, two bytes per move and captured stone, which
+    is what gets stored. Moves are taken back with `undo()` (and replayed with `redo()`) without copying
+    the game, decoding the last move from the history; `undo_stack` reads the history as Move objects.
+
+    `fork()` creates an independent copy of the position for lookahead. The flat arrays are copied,
+    while the groups and the set of seen positions are shared until either game changes them.
+
+    All per-game state lives in slots, and the per-point state in flat arrays, so a loaded 19x19
+    game takes a few dozen kilobytes (see the memory budget test).
+    """
+
+    __slots__ = (
+        "size_x",
+        "size_y",
+        "ko_rule",
+        "last_stone_placed",
+        "last_captured_single_stone",
+        "_colors",
+        "_neighbors",
+        "_parent",
+        "_next_stone",
+        "_groups",
+        "_owner",
+        "_zobrist",
+        "_hash",
+        "_hash_history",
+        "_seen_positions",
+        "_shares_seen_positions",
+        "_history_start_ko",
+        "redo_stack",
+        "history",
+    )
+
+    def __init__(self, size_x: int = 9, size_y: int = 9, ko_rule: KoRule = KoRule.SIMPLE) -> None:
         self.size_x: int = size_x
         self.size_y: int = size_y
-        self.board: list[list[GridPosition]] = []
+        self.ko_rule: KoRule = ko_rule
         self.last_stone_placed: tuple[int, int] | None = None
 
         self._check_board_size(size_x, size_y)
-        self._create_board()
+        self._colors: bytearray = bytearray(size_x * size_y)
+        self._neighbors: tuple[tuple[int, ...], ...] = NEIGHBOR_TABLES[(size_x, size_y)]
+        self._parent: list[int] = list(range(size_x * size_y))
+        self._next_stone: list[int] = list(range(size_x * size_y))
+        self._groups: dict[int, Group] = {}
+        self._owner: object = object()  # marks the groups this game may change in place
         self.last_captured_single_stone: tuple[int, int] | None = None
 
-    def _create_board(self) -> None:
-        for x in range(self.size_x):
-            column: list[GridPosition] = []
-            for y in range(self.size_y):
-                column.append(GridPosition())
-            self.board.append(column)
+        self._zobrist: ZobristKeys = ZOBRIST_KEYS[(size_x, size_y)]
+        self._hash: int = self._zobrist.empty_board
+        self._hash_history: array[int] = array("Q", [self._hash])
+        # the hash history as set for the superko rules, only built once one of them is checked
+        self._seen_positions: set[int] | None = None
+        self._shares_seen_positions: bool = False
+
+        self.redo_stack: list[Move] = []
+        self.history: array[int] = array("H")
+        # last stone placed and last captured single stone before the first move of the history
+        self._history_start_ko: tuple[tuple[int, int] | None, tuple[int, int] | None] = (None, None)
+
+    @classmethod
+    def from_position(cls, size_x: int, size_y: int, stones: dict[tuple[int, int], str], ko_rule: KoRule = KoRule.SIMPLE) -> "GoGame":
+        game = cls(size_x, size_y, ko_rule)
+        game.load_position(stones)
+        return game
+
+    def load_position(self, stones: dict[tuple[int, int], str]) -> None:
+        """
+        Replace the board with the given stones without checking any rules, building all groups and
+        liberties in a single flood fill pass. The position is trusted to be the result of legal play.
+        History, undo stack and ko state start over from this position.
+        """
+        colors = self._colors
+        zobrist_stones = self._zobrist.stones
+        position_hash = self._zobrist.empty_board
+        colors[:] = bytes(len(colors))
+        for (x, y), color in stones.items():
+            point = x * self.size_y + y
+            code = COLOR_CODES[color]
+            colors[point] = code
+            position_hash ^= zobrist_stones[code][point]
+
+        self._parent[:] = range(len(colors))
+        self._next_stone[:] = range(len(colors))
+        groups = self._groups
+        groups.clear()
+        for point in range(len(colors)):
+            if colors[point] != EMPTY and self._find(point) not in groups:
+                self._build_group(point)
+
+        self._hash = position_hash
+        self._hash_history = array("Q", [position_hash])
+        self._seen_positions = None
+        self._shares_seen_positions = False
+        self.redo_stack = []
+        self.history = array("H")
+        self._history_start_ko = (None, None)
+        self.last_stone_placed = None
+        self.last_captured_single_stone = None
+
+    def fork(self) -> "GoGame":
+        """Copy of the position and its history that can be played on without affecting this game"""
+        clone = GoGame.__new__(GoGame)
+        clone.size_x = self.size_x
+        clone.size_y = self.size_y
+        clone.ko_rule = self.ko_rule
+        clone.last_stone_placed = self.last_stone_placed
+        clone.last_captured_single_stone = self.last_captured_single_stone
+        clone._colors = self._colors[:]
+        clone._neighbors = self._neighbors
+        clone._parent = self._parent[:]
+        clone._next_stone = self._next_stone[:]
+        clone._groups = self._groups.copy()
+        clone._owner = object()
+        clone._zobrist = self._zobrist
+        clone._hash = self._hash
+        clone._hash_history = self._hash_history[:]
+        clone._seen_positions = self._seen_positions
+        clone._shares_seen_positions = True
+        clone.redo_stack = []
+        clone.history = self.history[:]
+        clone._history_start_ko = self._history_start_ko
+        # from now on, both games copy a shared group or set before changing it
+        self._owner = object()
+        self._shares_seen_positions = True
+        return clone
+
+    def to_bytes(self) -> bytes:
+        """
+        Compact encoding of the position for sending it to other processes: a small header, one byte
+        per point and the position history (in native byte order). The undo stack is not included.
+        """
+        last_stone = self.last_stone_placed
+        last_captured = self.last_captured_single_stone
+        header = _BYTES_HEADER.pack(
+            self.size_x,
+            self.size_y,
+            list(KoRule).index(self.ko_rule),
+            last_stone[0] * self.size_y + last_stone[1] if last_stone else _NO_POINT,
+            last_captured[0] * self.size_y + last_captured[1] if last_captured else _NO_POINT,
+        )
+        return header + self._colors + self._hash_history.tobytes()
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "GoGame":
+        """Restore a game encoded with `to_bytes()`"""
+        size_x, size_y, ko_rule, last_stone, last_captured = _BYTES_HEADER.unpack_from(data)
+        game = cls(size_x, size_y, list(KoRule)[ko_rule])
+        end_of_colors = _BYTES_HEADER.size + size_x * size_y
+        colors = data[_BYTES_HEADER.size : end_of_colors]
+        game.load_position({divmod(point, size_y): COLOR_NAMES[code] for point, code in enumerate(colors) if code})  # type: ignore
+        history = array("Q")
+        history.frombytes(data[end_of_colors:])
+        game._hash_history = history
+        game.last_stone_placed = divmod(last_stone, size_y) if last_stone != _NO_POINT else None
+        game.last_captured_single_stone = divmod(last_captured, size_y) if last_captured != _NO_POINT else None
+        return game
+
+    def _owned_group(self, root: int) -> Group:
+        group = self._groups[root]
+        if group.owner is not self._owner:
+            group = Group(group.color, group.size, set(group.liberties), self._owner)
+            self._groups[root] = group
+        return group
+
+    def _owned_seen_positions(self) -> set[int]:
+        if self._seen_positions is None or self._shares_seen_positions:
+            self._seen_positions = set(self._hash_history)
+            self._shares_seen_positions = False
+        return self._seen_positions
+
+    @property
+    def undo_stack(self) -> MoveStack:
+        """The moves that `undo()` takes back, the last one on top"""
+        return MoveStack(self)
+
+    @property
+    def board(self) -> Board:
+        return Board(self)
+
+    @property
+    def position_hash(self) -> int:
+        """Zobrist hash of the stones on the board, usable as a cache key for the position"""
+        return self._hash
+
+    def color_at(self, x: int, y: int) -> str | None:
+        return COLOR_NAMES[self._colors[x * self.size_y + y]]
 
     def place_stone_str_coord(self, coord: str, color: str) -> None:
         coord = coord.lower()
         self._check_stone_str_coord(coord)
         x, y = self._transform_coord(coord)
         self.place_stone(x, y, color)
-        self.last_stone_placed = (x, y)
+
+    @staticmethod
+    def to_str_coord(x: int, y: int) -> str:
+        """The coordinate of (x, y) as accepted by `place_stone_str_coord`"""
+        return f"{chr(ord('a') + x)}{y + 1}"
 
     def place_stone(self, x: int, y: int, color: str) -> None:
         self._check_stone_coord(x, y)
-        self._check_pos_taken(x, y)
-
-        adjacent_groups = self._detect_adjacent_groups(x, y, color)
-        own_group = {item for groups in adjacent_groups for item in groups}  # flatten
-        own_group.add((x, y))
-        adjacent_opponent_groups = self._detect_adjacent_groups(x, y, REVERSE[color])
-        opponent_groups_atari = [group for group in adjacent_opponent_groups if len(self._group_liberties(group)) == 1]
-
-        self._check_ko(opponent_groups_atari)
-        self._check_self_capture((x, y), own_group, opponent_groups_atari)
-
-        self._capture_neighbors(opponent_groups_atari)
-        self._merge_groups(own_group, color)
-
-    def _capture_neighbors(self, opponent_groups: list[set[tuple[int, int]]]) -> None:
+        point = x * self.size_y + y
+        self._check_pos_taken(point)
+
+        own = COLOR_CODES[color]
+        groups = self._groups
+        adjacent_roots = self._adjacent_roots(point)
+        opponent_groups_atari = [root for root in adjacent_roots if groups[root].color != own and len(groups[root].liberties) == 1]
+
+        self._check_ko(point, own, opponent_groups_atari)
+        self._check_self_capture(point, own, adjacent_roots, opponent_groups_atari)
+
+        if not self.history:
+            self._history_start_ko = (self.last_stone_placed, self.last_captured_single_stone)
+        self._colors[point] = own
+        self._hash ^= self._zobrist.stones[own][point]
+        for root in adjacent_roots:
+            self._owned_group(root).liberties.discard(point)
+        self._merge_groups(point, own, [root for root in adjacent_roots if groups[root].color == own])
+        captured = self._capture_neighbors(opponent_groups_atari)
+        self._record_position(own)
+        self.last_stone_placed = (x, y)
+        self.redo_stack.clear()
+        self.history.append(point << 2 | own)
+        self.history.extend(stone << 2 | CAPTURED for stone in captured)
+
+    def pass_turn(self, color: str) -> None:
+        """Let `color` skip its move, which is recorded like a placed stone and can be undone"""
+        if not self.history:
+            self._history_start_ko = (self.last_stone_placed, self.last_captured_single_stone)
+        self.redo_stack.clear()
+        self.history.append(len(self._colors) << 2 | COLOR_CODES[color])
+
+    def moves(self) -> Iterator[Move]:
+        """The moves of `history`, oldest first"""
+        history = self.history
+        pass_point = len(self._colors)
+        last_stone_placed, last_captured_single_stone = self._history_start_ko
+        i = 0
+        while i < len(history):
+            point, code = history[i] >> 2, history[i] & 3
+            i += 1
+            captured = []
+            while i < len(history) and history[i] & 3 == CAPTURED:
+                captured.append(self._to_coord(history[i] >> 2))
+                i += 1
+            coord = None if point == pass_point else self._to_coord(point)
+            yield Move(coord, COLOR_NAMES[code], captured, last_stone_placed, last_captured_single_stone)  # type: ignore
+            if coord is not None:
+                last_stone_placed = coord
+                last_captured_single_stone = captured[0] if len(captured) == 1 else None
+
+    def _decode_move(self, end: int) -> tuple[Move, int]:
+        """The move whose entries in `history` end at index `end`, and the index they start at"""
+        history = self.history
+        start = end - 1
+        while history[start] & 3 == CAPTURED:
+            start -= 1
+        point, code = history[start] >> 2, history[start] & 3
+        coord = None if point == len(self._colors) else self._to_coord(point)
+        captured = [self._to_coord(entry >> 2) for entry in history[start + 1 : end]]
+        return Move(coord, COLOR_NAMES[code], captured, *self._ko_state_at(start)), start  # type: ignore
+
+    def _ko_state_at(self, end: int) -> tuple[tuple[int, int] | None, tuple[int, int] | None]:
+        """Last stone placed and last captured single stone after the first `end` entries of `history`"""
+        history = self.history
+        pass_point = len(self._colors)
+        while end:
+            start = end - 1
+            while history[start] & 3 == CAPTURED:
+                start -= 1
+            if history[start] >> 2 != pass_point:
+                captured = self._to_coord(history[start + 1] >> 2) if end - start == 2 else None
+                return self._to_coord(history[start] >> 2), captured
+            end = start
+        return self._history_start_ko
+
+    def history_bytes(self) -> bytes:
+        """`history` in little-endian byte order, for storing it"""
+        if sys.byteorder == "little":
+            return self.history.tobytes()
+        history = self.history[:]
+        history.byteswap()
+        return history.tobytes()
+
+    def load_history(self, data: bytes) -> None:
+        """
+        Attach the history (from `history_bytes()`) of the moves that led to the current position,
+        which restores the undo stack, the ko state and the positions seen for the superko rules.
+        """
+        history = array("H")
+        history.frombytes(data)
+        if sys.byteorder == "big":
+            history.byteswap()
+        self.history = history
+        self.redo_stack = []
+        self._history_start_ko = (None, None)
+
+        # walk back from the current position, undoing the moves on the hash only
+        stone_keys = self._zobrist.stones
+        pass_point = len(self._colors)
+        position_hash = self._hash
+        keys = []
+        captured: list[int] = []
+        for entry in reversed(history):
+            point, code = entry >> 2, entry & 3
+            if code == CAPTURED:
+                captured.append(point)
+                continue
+            if point != pass_point:
+                keys.append(self._situation_key(position_hash, code))
+                position_hash ^= stone_keys[code][point]
+                for stone in captured:
+                    position_hash ^= stone_keys[code ^ 3][stone]
+            captured.clear()
+        keys.append(position_hash)
+        keys.reverse()
+        self._hash_history = array("Q", keys)
+        self._seen_positions = None
+        self._shares_seen_positions = False
+
+        self.last_stone_placed, self.last_captured_single_stone = self._ko_state_at(len(history))
+
+    def is_legal(self, x: int, y: int, color: str) -> bool:
+        """Whether `place_stone(x, y, color)` would succeed, without changing the game"""
+        if not (0 <= x < self.size_x and 0 <= y < self.size_y):
+            return False
+        point = x * self.size_y + y
+        return self._colors[point] == EMPTY and self._is_legal(point, COLOR_CODES[color])
+
+    def legal_moves(self, color: str) -> int:
+        """Bitmask of all points `color` may play on, bit `x * size_y + y` standing for `(x, y)`"""
+        own = COLOR_CODES[color]
+        colors = self._colors
+        mask = 0
+        for point in range(len(colors)):
+            if colors[point] == EMPTY and self._is_legal(point, own):
+                mask |= 1 << point
+        return mask
+
+    def is_eye(self, x: int, y: int, color: str) -> bool:
+        """Whether (x, y) is a free point surrounded only by stones of `color`"""
+        point = x * self.size_y + y
+        colors = self._colors
+        if colors[point] != EMPTY:
+            return False
+        own = COLOR_CODES[color]
+        for neighbor in self._neighbors[point]:
+            if colors[neighbor] != own:
+                return False
+        return True
+
+    def last_liberties(self, color: str) -> set[tuple[int, int]]:
+        """The points that are the only liberty left of a group of `color`, i.e. where it can be captured"""
+        own = COLOR_CODES[color]
+        return {self._to_coord(next(iter(group.liberties))) for group in self._groups.values() if group.color == own and len(group.liberties) == 1}
+
+    def calculate_result(self, komi: float = DEFAULT_KOMI) -> GameResult:
+        """
+        Tromp-Taylor area scoring: every stone counts for its color, and every empty region
+        counts for the color that is the only one it touches.
+        """
+        colors = self._colors
+        neighbors = self._neighbors
+        area = [0, colors.count(BLACK), colors.count(WHITE)]
+        visited = bytearray(len(colors))
+        for start in range(len(colors)):
+            if colors[start] != EMPTY or visited[start]:
+                continue
+            visited[start] = 1
+            region = [start]
+            touched = EMPTY  # bitwise or of the bordering colors, BLACK | WHITE means neutral
+            i = 0
+            while i < len(region):
+                for neighbor in neighbors[region[i]]:
+                    neighbor_color = colors[neighbor]
+                    if neighbor_color != EMPTY:
+                        touched |= neighbor_color
+                    elif not visited[neighbor]:
+                        visited[neighbor] = 1
+                        region.append(neighbor)
+                i += 1
+            if touched == BLACK or touched == WHITE:
+                area[touched] += len(region)
+        return GameResult(black=area[BLACK], white=area[WHITE] + komi, komi=komi)
+
+    def _is_legal(self, point: int, own: int) -> bool:
+        groups = self._groups
+        colors = self._colors
+        if self.ko_rule == KoRule.SIMPLE:
+            # fast path: with a free neighbor and nothing to capture, the move can be neither ko nor self-capture
+            neighbor_in_atari = False
+            has_liberty = False
+            for neighbor in self._neighbors[point]:
+                neighbor_color = colors[neighbor]
+                if neighbor_color == EMPTY:
+                    has_liberty = True
+                elif neighbor_color != own and len(groups[self._find(neighbor)].liberties) == 1:
+                    neighbor_in_atari = True
+            if has_liberty and not neighbor_in_atari:
+                return True
+
+        adjacent_roots = self._adjacent_roots(point)
+        opponent_groups_atari = [root for root in adjacent_roots if groups[root].color != own and len(groups[root].liberties) == 1]
+        if self._violates_ko_rule(point, own, opponent_groups_atari):
+            return False
+        return not self._is_self_capture(point, own, adjacent_roots, opponent_groups_atari)
+
+    def undo(self) -> None:
+        """Take back the last placed stone or pass, restoring captured stones and the ko state"""
+        if not self.history:
+            raise NothingToUndoException(strings.error_nothing_to_undo)
+        move, start = self._decode_move(len(self.history))
+        del self.history[start:]
+        self.redo_stack.append(move)
+        if move.coord is not None:
+            self._take_back(move)
+
+    def redo(self) -> None:
+        """Replay the last move taken back with `undo()`"""
+        if not self.redo_stack:
+            raise NothingToRedoException(strings.error_nothing_to_redo)
+        move = self.redo_stack.pop()
+        # placing a stone discards the redo stack, keep it for the moves after this one
+        redo_stack, self.redo_stack = self.redo_stack, []
+        if move.coord is None:
+            self.pass_turn(move.color)
+        else:
+            self.place_stone(*move.coord, move.color)
+        self.redo_stack = redo_stack
+
+    def _take_back(self, move: Move) -> None:
+        assert move.coord is not None
+        colors = self._colors
+        groups = self._groups
+        parent = self._parent
+        next_stone = self._next_stone
+        neighbors = self._neighbors
+        stone_keys = self._zobrist.stones
+        point = move.coord[0] * self.size_y + move.coord[1]
+        own = COLOR_CODES[move.color]
+        opponent = own ^ 3
+
+        # remove the stone and split its group back into the groups it joined
+        root = self._find(point)
+        group_stones = list(self._group_stones(root))
+        del groups[root]
+        for stone in group_stones:
+            parent[stone] = stone
+            next_stone[stone] = stone
+        colors[point] = EMPTY
+        self._hash ^= stone_keys[own][point]
+        for neighbor in neighbors[point]:
+            if colors[neighbor] == own and self._find(neighbor) not in groups:
+                self._build_group(neighbor)
+            elif colors[neighbor] == opponent:
+                self._owned_group(self._find(neighbor)).liberties.add(point)
+
+        # put the captured stones back
+        captured = [x * self.size_y + y for x, y in move.captured]
+        for stone in captured:
+            colors[stone] = opponent
+            self._hash ^= stone_keys[opponent][stone]
+        for stone in captured:
+            if self._find(stone) not in groups:
+                self._build_group(stone)
+            for neighbor in neighbors[stone]:
+                if colors[neighbor] == own:
+                    self._owned_group(self._find(neighbor)).liberties.discard(stone)
+
+        if len(self._hash_history) > 1:
+            key = self._hash_history.pop()
+            if self._seen_positions is not None and key not in self._hash_history:
+                self._owned_seen_positions().discard(key)
+        else:
+            # the game was loaded without its history, so it starts over from the restored position
+            self._hash_history[0] = self._situation_key(self._hash, opponent)
+            self._seen_positions = None
+            self._shares_seen_positions = False
+        self.last_stone_placed = move.last_stone_placed
+        self.last_captured_single_stone = move.last_captured_single_stone
+
+    def _build_group(self, start: int) -> None:
+        """Create the group containing the stone at `start` from scratch with a flood fill"""
+        colors = self._colors
+        neighbors = self._neighbors
+        parent = self._parent
+        next_stone = self._next_stone
+        color = colors[start]
+        stones = [start]
+        visited = {start}
+        liberties: set[int] = set()
+        i = 0
+        while i < len(stones):
+            for neighbor in neighbors[stones[i]]:
+                neighbor_color = colors[neighbor]
+                if neighbor_color == EMPTY:
+                    liberties.add(neighbor)
+                elif neighbor_color == color and neighbor not in visited:
+                    visited.add(neighbor)
+                    stones.append(neighbor)
+            i += 1
+        for i, stone in enumerate(stones):
+            parent[stone] = start
+            next_stone[stone] = stones[i - 1]
+        self._groups[start] = Group(color, len(stones), liberties, self._owner)
+
+    def _situation_key(self, position_hash: int, moved: int) -> int:
+        """Key stored in the position history, which includes the player to move for situational superko"""
+        if self.ko_rule == KoRule.SITUATIONAL_SUPERKO and moved == BLACK:
+            return position_hash ^ self._zobrist.white_to_move
+        return position_hash
+
+    def _record_position(self, moved: int) -> None:
+        key = self._situation_key(self._hash, moved)
+        self._hash_history.append(key)
+        if self._seen_positions is not None:
+            self._owned_seen_positions().add(key)
+
+    def _has_neighbor(self, point: int, color: int) -> bool:
+        colors = self._colors
+        for neighbor in self._neighbors[point]:
+            if colors[neighbor] == color:
+                return True
+        return False
+
+    def _find(self, point: int) -> int:
+        """Root of the group containing the stone at `point`"""
+        parent = self._parent
+        while parent[point] != point:
+            # path halving: every visited stone skips one level
+            parent[point] = parent[parent[point]]
+            point = parent[point]
+        return point
+
+    def _adjacent_roots(self, point: int) -> list[int]:
+        colors = self._colors
+        roots: list[int] = []
+        for neighbor in self._neighbors[point]:
+            if colors[neighbor] != EMPTY:
+                root = self._find(neighbor)
+                if root not in roots:
+                    roots.append(root)
+        return roots
+
+    def _group_stones(self, point: int) -> Iterator[int]:
+        next_stone = self._next_stone
+        stone = point
+        while True:
+            yield stone
+            stone = next_stone[stone]
+            if stone == point:
+                return
+
+    def _merge_groups(self, point: int, color: int, own_roots: list[int]) -> None:
+        """Join the stone at `point` with its adjacent groups of the same color"""
+        colors = self._colors
+        groups = self._groups
+        groups[point] = Group(color, 1, {neighbor for neighbor in self._neighbors[point] if colors[neighbor] == EMPTY}, self._owner)
+        root = point
+        for other in own_roots:
+            root = self._union(root, other)
+
+    def _union(self, root_a: int, root_b: int) -> int:
+        groups = self._groups
+        if groups[root_a].size < groups[root_b].size:
+            root_a, root_b = root_b, root_a
+        group_a = self._owned_group(root_a)
+        group_b = groups[root_b]
+
+        self._parent[root_b] = root_a
+        del groups[root_b]
+        group_a.size += group_b.size
+        # fold the smaller liberty set into the larger one, unless the larger one is shared with a fork
+        if len(group_a.liberties) < len(group_b.liberties) and group_b.owner is self._owner:
+            group_a.liberties, group_b.liberties = group_b.liberties, group_a.liberties
+        group_a.liberties |= group_b.liberties
+        # splice the two stone rings
+        next_stone = self._next_stone
+        next_stone[root_a], next_stone[root_b] = next_stone[root_b], next_stone[root_a]
+        return root_a
+
+    def _capture_neighbors(self, opponent_roots: list[int]) -> list[int]:
+        groups = self._groups
         self.last_captured_single_stone = None
-        if len(opponent_groups) == 1 and len(opponent_groups[0]) == 1:
-            self.last_captured_single_stone = list(opponent_groups[0])[0]
-
-        for group in opponent_groups:
-            for x, y in group.copy():
-                self.board[x][y].group.remove((x, y))  # remove stone from the group
-                self.board[x][y].clear()  # clear board position
-
-    def _merge_groups(self, new_group: set[tuple[int, int]], color: str) -> None:
-        for x, y in new_group:
-            self.board[x][y].group = new_group
-            self.board[x][y].color = color
-
-    def _group_liberties(self, group: set[tuple[int, int]]) -> set[tuple[int, int]]:
-        group_liberties: set[tuple[int, int]] = set()
-        for stone in group:
-            stone_liberties = {(x, y) for x, y in self._neighbors_of(*stone) if self.board[x][y].is_free}
-            group_liberties = group_liberties.union(stone_liberties)
-        return group_liberties
-
-    def _detect_adjacent_groups(self, x: int, y: int, color: str) -> list[set[tuple[int, int]]]:
-        return [self.board[x][y].group for x, y in self._neighbors_of(x, y, color)]
-
-    def _neighbors_of(self, x: int, y: int, color: str | None = None) -> list[tuple[int, int]]:
-        neighbors: list[tuple[int, int]] = []
-        if x > 0:
-            neighbors.append((x - 1, y))
-        if x < self.size_x - 1:
-            neighbors.append((x + 1, y))
-        if y > 0:
-            neighbors.append((x, y - 1))
-        if y < self.size_y - 1:
-            neighbors.append((x, y + 1))
-
-        if color is not None:
-            neighbors = [(x, y) for x, y in neighbors if self.board[x][y].color == color]
-        return neighbors
+        if len(opponent_roots) == 1 and groups[opponent_roots[0]].size == 1:
+            self.last_captured_single_stone = self._to_coord(opponent_roots[0])
+
+        colors = self._colors
+        parent = self._parent
+        next_stone = self._next_stone
+        neighbors = self._neighbors
+        stone_keys = self._zobrist.stones
+        all_captured: list[int] = []
+        for root in opponent_roots:
+            captured = list(self._group_stones(root))
+            all_captured.extend(captured)
+            captured_keys = stone_keys[groups[root].color]
+            del groups[root]
+            for stone in captured:
+                colors[stone] = EMPTY
+                self._hash ^= captured_keys[stone]
+                parent[stone] = stone
+                next_stone[stone] = stone
+            # the captured points become liberties of the surrounding groups
+            for stone in captured:
+                for neighbor in neighbors[stone]:
+                    if colors[neighbor] != EMPTY:
+                        self._owned_group(self._find(neighbor)).liberties.add(stone)
+        return all_captured
+
+    def _to_coord(self, point: int) -> tuple[int, int]:
+        return divmod(point, self.size_y)
 
     @staticmethod
     def _transform_coord(coord: str) -> tuple[int, int]:
@@ -108,7 +875,7 @@ class GoGame:
 
     @staticmethod
     def _check_board_size(size_x: int, size_y: int) -> None:
-        if (size_x, size_y) not in [(9, 9), (13, 13), (19, 19)]:
+        if (size_x, size_y) not in SUPPORTED_SIZES:
             raise InvalidBoardSizeException(strings.error_invalid_size)
 
     @staticmethod
@@ -124,11 +891,20 @@ class GoGame:
         if not x_in_range or not y_in_range:
             raise InvalidCoordinateException(strings.error_invalid_coords)
 
-    def _check_pos_taken(self, x: int, y: int) -> None:
-        if not self.board[x][y].is_free:
+    def _check_pos_taken(self, point: int) -> None:
+        if self._colors[point] != EMPTY:
             raise CoordOccupiedException(strings.error_coord_occupied)
 
-    def _check_ko(self, opponent_groups: list[set[tuple[int, int]]]) -> None:
+    def _check_ko(self, point: int, color: int, opponent_roots: list[int]) -> None:
+        if self._violates_ko_rule(point, color, opponent_roots):
+            raise KoException(strings.error_ko)
+
+    def _violates_ko_rule(self, point: int, color: int, opponent_roots: list[int]) -> bool:
+        if self.ko_rule == KoRule.SIMPLE:
+            return self._is_ko(opponent_roots)
+        return self._is_superko(point, color, opponent_roots)
+
+    def _is_ko(self, opponent_roots: list[int]) -> bool:
         """
         Conditions:
         - Last round exactly one stone was captured
@@ -137,26 +913,41 @@ class GoGame:
         """
 
         if self.last_captured_single_stone is None:
-            return
+            return False
 
         single_threatened_neighbor: tuple[int, int] | None = None
-        for group in opponent_groups:
-            group_liberties = len(self._group_liberties(group))
-            if group_liberties == 1 and len(group) == 1:
+        for root in opponent_roots:
+            if self._groups[root].size == 1:
                 more_than_one_target = single_threatened_neighbor is not None
                 if more_than_one_target:
-                    return
-                single_threatened_neighbor = list(group)[0]
-
-        if self.last_stone_placed == single_threatened_neighbor:
-            raise KoException(strings.error_ko)
+                    return False
+                single_threatened_neighbor = self._to_coord(root)
+
+        return single_threatened_neighbor is not None and self.last_stone_placed == single_threatened_neighbor
+
+    def _is_superko(self, point: int, color: int, opponent_roots: list[int]) -> bool:
+        """The move must not recreate any earlier position (or situation, including the player to move)"""
+        stone_keys = self._zobrist.stones
+        position_hash = self._hash ^ stone_keys[color][point]
+        captured_keys = stone_keys[color ^ 3]
+        for root in opponent_roots:
+            for stone in self._group_stones(root):
+                position_hash ^= captured_keys[stone]
+        seen_positions = self._seen_positions
+        if seen_positions is None:
+            seen_positions = self._owned_seen_positions()
+        return self._situation_key(position_hash, color) in seen_positions
+
+    def _check_self_capture(self, point: int, color: int, adjacent_roots: list[int], opponent_roots: list[int]) -> None:
+        if self._is_self_capture(point, color, adjacent_roots, opponent_roots):
+            raise SelfCaptureException(strings.error_self_capture)
 
-    def _check_self_capture(self, stone: tuple[int, int], group: set[tuple[int, int]], opponent_groups: list[set[tuple[int, int]]]) -> None:
-        if opponent_groups:
-            return
+    def _is_self_capture(self, point: int, color: int, adjacent_roots: list[int], opponent_roots: list[int]) -> bool:
+        if opponent_roots:
+            return False
 
-        group_liberties = self._group_liberties(group)
-        if stone in group_liberties:
-            group_liberties.remove(stone)
-        if not group_liberties:
-            raise SelfCaptureException(strings.error_self_capture)
+        if self._has_neighbor(point, EMPTY):
+            return False
+        # an own group keeps a liberty other than `point` after the merge
+        groups = self._groups
+        return not any(groups[root].color == color and len(groups[root].liberties) > 1 for root in adjacent_roots)
@@ -1,13 +1,18 @@
+import functools
+import math
+from collections.abc import Hashable
+from dataclasses import dataclass, field
 from io import BytesIO
 
 from PIL import Image, ImageDraw
-from PIL.ImageFile import ImageFile
 
 from gobot.go import strings
 from gobot.go.go import GoGame
+from gobot.go.image_format import ImageFormat
 from gobot.go.vec2 import Vec2
 
 StoneRGBAColor = tuple[int, int, int, int]
+PixelBox = tuple[int, int, int, int]
 
 board_map = {
     9: strings.board_9_path,
@@ -15,62 +20,213 @@ board_map = {
     19: strings.board_19_path,
 }
 stone_colors: dict[str, StoneRGBAColor] = {
-    "white": (255, 255, 255, 0),
-    "black": (0, 0, 0, 0),
+    "white": (255, 255, 255, 255),
+    "black": (0, 0, 0, 255),
 }
 stone_border_colors: dict[str, StoneRGBAColor] = {
     "white": stone_colors["black"],
     "black": stone_colors["white"],
 }
 
+# sprites are drawn this many times larger and scaled down, which smooths their edges
+SUPERSAMPLING = 4
+
+# the last image rendered per key (e.g. per chat), kept across warm invocations so the next one only redraws what changed;
+# a full-size frame takes about 2 MB, so the cache is bounded by the bytes of its images and keeps the most recent ones
+MAX_CACHED_FRAME_BYTES = 16 * 1024 * 1024
+_frames: dict[Hashable, "Frame"] = {}
+
+
+@dataclass(frozen=True, slots=True)
+class ImageEncoding:
+    """
+    How board images are encoded for uploading. `quality` applies to JPEG and WebP, `palette_colors` reduces
+    the image to that many colors first (PNG and WebP), and `resolutions` renders the images of a board size
+    at the given width and height in pixels instead of the size of the background image.
+    """
+
+    format: ImageFormat = ImageFormat.JPEG
+    quality: int = 75
+    palette_colors: int | None = None
+    resolutions: dict[int, int] = field(default_factory=dict)
+
+    def __post_init__(self) -> None:
+        if not 1 <= self.quality <= 100:
+            raise ValueError("The image quality has to be between 1 and 100")
+        if self.palette_colors is not None and not (2 <= self.palette_colors <= 256 and self.format != ImageFormat.JPEG):
+            raise ValueError("A palette of 2 to 256 colors needs PNG or WebP")
+        if any(resolution <= 0 for resolution in self.resolutions.values()):
+            raise ValueError("The image resolutions have to be positive")
+
+
+DEFAULT_ENCODING = ImageEncoding()
 
-def take_in_memory_screenshot(go_game: GoGame) -> BytesIO:
-    bytes_io = BytesIO()
-    image = take_screenshot(go_game)
-    image.save(bytes_io, "JPEG")
-    bytes_io.seek(0)
-    return bytes_io
 
+@dataclass(frozen=True, slots=True)
+class BoardTemplate:
+    """
+    The decoded background image of a board size, the sprites per stone color and where they go:
+    the pixels a stone and a marker cover on each intersection, indexed by point like the GoGame board.
+    At small resolutions the boxes of neighboring stones overlap, see `stones_overlap`.
+    """
 
-def take_screenshot(go_game: GoGame) -> ImageFile:
-    background_image: str = board_map[go_game.size_x]
-    img = Image.open(background_image)
-    draw = ImageDraw.Draw(img)
+    image: Image.Image
+    stones: dict[str, Image.Image]
+    markers: dict[str, Image.Image]
+    stone_boxes: tuple[PixelBox, ...]
+    marker_boxes: tuple[PixelBox, ...]
+    stones_overlap: bool
 
-    background = Vec2(*img.size)
+
+@dataclass(frozen=True, slots=True)
+class Frame:
+    """A rendered image, the template it started from and the board it shows, as color per point and the marked point"""
+
+    image: Image.Image
+    template: "BoardTemplate"
+    colors: tuple[str | None, ...]
+    marked: int | None
+
+    @property
+    def nbytes(self) -> int:
+        return self.image.width * self.image.height * len(self.image.getbands())
+
+
+@functools.cache
+def board_template(size: int, resolution: int | None = None) -> BoardTemplate:
+    """
+    Decoded once per process, so warm Lambda invocations skip reading and decoding the JPEG.
+    With a `resolution`, the background is scaled to it here and the sprites are drawn at that scale.
+    """
+    with Image.open(board_map[size]) as file:
+        image = file.copy()
+    if resolution is not None and resolution != image.width:
+        image = image.resize((resolution, resolution), Image.Resampling.LANCZOS)
+
+    background = Vec2(*image.size)
     border_size: Vec2 = background * 0.125
-    cell_width: Vec2 = (background - border_size * 2) / (go_game.size_x - 1)
-    grid_start: Vec2 = background * 0.5 - cell_width * (go_game.size_x - 1) * 0.5
+    cell_width: Vec2 = (background - border_size * 2) / (size - 1)
+    grid_start: Vec2 = background * 0.5 - cell_width * (size - 1) * 0.5
     stone_size: Vec2 = cell_width * 0.9
     mark_size: Vec2 = stone_size * 0.5
+    stones = {color: _stone_sprite(color, stone_size) for color in stone_colors}
+    markers = {color: _marker_sprite(stone_border_colors[color], mark_size) for color in stone_colors}
+    # black and white sprites have the same size
+    centers = [grid_start + cell_width * (x, y) for x in range(size) for y in range(size)]
+    stone_boxes = _boxes(centers, stones["black"])
+    return BoardTemplate(image, stones, markers, stone_boxes, _boxes(centers, markers["black"]), _boxes_overlap(stone_boxes, size))
+
+
+def _boxes(centers: list[Vec2], sprite: Image.Image) -> tuple[PixelBox, ...]:
+    boxes = []
+    for center in centers:
+        left = round(center.x - sprite.width / 2)
+        top = round(center.y - sprite.height / 2)
+        boxes.append((left, top, left + sprite.width, top + sprite.height))
+    return tuple(boxes)
+
+
+def _boxes_overlap(boxes: tuple[PixelBox, ...], size: int) -> bool:
+    """Whether any box reaches into the box of the intersection to its right or below it"""
+    for point, (_, _, right, bottom) in enumerate(boxes):
+        x, y = divmod(point, size)
+        if x + 1 < size and right > boxes[point + size][0]:
+            return True
+        if y + 1 < size and bottom > boxes[point + 1][1]:
+            return True
+    return False
 
-    def _get_bounding_box(coord: Vec2, stone_size: Vec2):
-        bb_start: Vec2 = grid_start + cell_width * coord - stone_size * 0.5
-        bb_end: Vec2 = bb_start + stone_size
-        return bb_start, bb_end
-
-    for x in range(go_game.size_x):
-        for y in range(go_game.size_y):
-            if go_game.board[x][y].is_free:
-                continue
-
-            stone_color = stone_colors[go_game.board[x][y].color]  # type: ignore
-            border_color = stone_border_colors[go_game.board[x][y].color]  # type: ignore
-
-            coord: Vec2 = Vec2(x, y)
-            # only draw black borders on white stones
-            if go_game.board[x][y].color == "white":
-                bb_start, bb_end = _get_bounding_box(coord, stone_size)
-                draw.ellipse((*bb_start, *bb_end), fill=border_color)
-                bb_start, bb_end = _get_bounding_box(coord, stone_size * 0.85)
-            else:
-                bb_start, bb_end = _get_bounding_box(coord, stone_size)
-            draw.ellipse((*bb_start, *bb_end), fill=stone_color)
-
-            if (x, y) == go_game.last_stone_placed:
-                mark_color_value = border_color
-                bb_start = grid_start + cell_width * coord - mark_size * 0.5
-                bb_end = bb_start + mark_size
-                draw.rectangle((*bb_start, *bb_end), outline=mark_color_value, width=3)
 
+def _stone_sprite(color: str, stone_size: Vec2) -> Image.Image:
+    sprite, draw, center = _sprite_canvas(stone_size)
+
+    def circle(scale: float, fill: StoneRGBAColor) -> None:
+        radius = stone_size * (SUPERSAMPLING * scale * 0.5)
+        draw.ellipse((*(center - radius), *(center + radius)), fill=fill)
+
+    # only white stones get a (black) border
+    if color == "white":
+        circle(1, stone_border_colors[color])
+        circle(0.85, stone_colors[color])
+    else:
+        circle(1, stone_colors[color])
+    return sprite.resize((sprite.width // SUPERSAMPLING, sprite.height // SUPERSAMPLING), Image.Resampling.BOX)
+
+
+def _marker_sprite(color: StoneRGBAColor, mark_size: Vec2) -> Image.Image:
+    sprite, draw, center = _sprite_canvas(mark_size)
+    half = mark_size * (SUPERSAMPLING * 0.5)
+    draw.rectangle((*(center - half), *(center + half)), outline=color, width=3 * SUPERSAMPLING)
+    return sprite.resize((sprite.width // SUPERSAMPLING, sprite.height // SUPERSAMPLING), Image.Resampling.BOX)
+
+
+def _sprite_canvas(size: Vec2) -> tuple[Image.Image, ImageDraw.ImageDraw, Vec2]:
+    """A transparent supersampled image with a pixel of margin around `size`, and its center"""
+    width, height = (math.ceil(value) + 2 for value in size)
+    sprite = Image.new("RGBA", (width * SUPERSAMPLING, height * SUPERSAMPLING))
+    return sprite, ImageDraw.Draw(sprite), Vec2(*sprite.size) * 0.5
+
+
+def take_in_memory_screenshot(go_game: GoGame, key: Hashable | None = None, encoding: ImageEncoding = DEFAULT_ENCODING) -> BytesIO:
+    return encode_image(take_screenshot(go_game, key, encoding.resolutions.get(go_game.size_x)), encoding)
+
+
+def encode_image(image: Image.Image, encoding: ImageEncoding = DEFAULT_ENCODING) -> BytesIO:
+    if encoding.palette_colors:
+        image = image.quantize(encoding.palette_colors, Image.Quantize.FASTOCTREE)
+
+    bytes_io = BytesIO()
+    if encoding.format == ImageFormat.PNG:
+        image.save(bytes_io, "PNG")
+    else:
+        image.save(bytes_io, encoding.format, quality=encoding.quality)
+    bytes_io.seek(0)
+    return bytes_io
+
+
+def take_screenshot(go_game: GoGame, key: Hashable | None = None, resolution: int | None = None) -> Image.Image:
+    """
+    Render the board. With a `key`, the image is kept and the next render for the same key starts from it,
+    redrawing only the intersections that changed in between; the returned image must not be modified then.
+    `resolution` is the width and height of the image, by default that of the background image.
+    """
+    size = (go_game.size_x, go_game.size_y)
+    template = board_template(go_game.size_x, resolution)
+    colors = tuple(go_game.color_at(x, y) for x in range(size[0]) for y in range(size[1]))
+    last = go_game.last_stone_placed
+    marked = last[0] * size[1] + last[1] if last is not None and go_game.color_at(*last) is not None else None
+
+    previous = _frames.get(key) if key is not None else None
+    # restoring the background under a stone would cut into overlapping neighbors, those are always drawn in full
+    if previous is None or previous.template is not template or template.stones_overlap:
+        img = template.image.copy()
+        for point, color in enumerate(colors):
+            if color is not None:
+                _draw_intersection(img, template, point, color, marked)
+    else:
+        img = previous.image.copy()
+        changed = {point for point, color in enumerate(colors) if color != previous.colors[point]}
+        # the marker moves from the previous last stone to the new one
+        changed.update(point for point in (previous.marked, marked) if point is not None)
+        for point in changed:
+            # the boxes do not overlap, so the background under a stone touches no other stone
+            box = template.stone_boxes[point]
+            img.paste(template.image.crop(box), box)
+            if (color := colors[point]) is not None:
+                _draw_intersection(img, template, point, color, marked)
+
+    if key is not None:
+        _frames.pop(key, None)
+        _frames[key] = Frame(img, template, colors, marked)
+        cached_bytes = sum(frame.nbytes for frame in _frames.values())
+        while cached_bytes > MAX_CACHED_FRAME_BYTES and len(_frames) > 1:
+            cached_bytes -= _frames.pop(next(iter(_frames))).nbytes
     return img
+
+
+def _draw_intersection(img: Image.Image, template: BoardTemplate, point: int, color: str, marked: int | None) -> None:
+    stone = template.stones[color]
+    img.paste(stone, template.stone_boxes[point], stone)
+    if point == marked:
+        marker = template.markers[color]
+        img.paste(marker, template.marker_boxes[point], marker)
@@ -0,0 +1,7 @@
+from enum import StrEnum
+
+
+class ImageFormat(StrEnum):
+    JPEG = "JPEG"
+    PNG = "PNG"
+    WEBP = "WEBP"
@@ -0,0 +1,225 @@
+import math
+import random
+import time
+from collections.abc import Iterator
+from concurrent.futures import Executor
+from dataclasses import dataclass
+
+from gobot.go.go import DEFAULT_KOMI, REVERSE, GoGame
+from gobot.go.playout import random_playout
+
+DEFAULT_EXPLORATION = 1.4
+# progressive widening: a node only gets another child while it has fewer than 1 + WIDENING * sqrt(visits),
+# so even the few hundred visits of a 19x19 search compare moves on more than a single playout each
+WIDENING = 2.0
+
+
+class Node:
+    """A position in the search tree, reached by `color` playing `move` (None for a pass)"""
+
+    __slots__ = ("move", "color", "position_hash", "parent", "children", "untried", "visits", "wins")
+
+    def __init__(self, move: tuple[int, int] | None, color: str, position_hash: int, parent: "Node | None") -> None:
+        self.move = move
+        self.color = color
+        self.position_hash = position_hash
+        self.parent = parent
+        self.children: list[Node] = []
+        self.untried: list[tuple[int, int]] | None = None  # filled on the first visit
+        self.visits: int = 0
+        self.wins: int = 0  # playouts won by `color`
+
+    @property
+    def widens(self) -> bool:
+        """Whether the next visit adds a child instead of selecting one of the existing children"""
+        return bool(self.untried) and len(self.children) < 1 + WIDENING * math.sqrt(self.visits)
+
+    def uct_child(self, exploration: float) -> "Node":
+        log_visits = math.log(self.visits)
+        return max(self.children, key=lambda child: child.wins / child.visits + exploration * math.sqrt(log_visits / child.visits))
+
+    def subtree(self) -> Iterator["Node"]:
+        stack: list[Node] = [self]
+        while stack:
+            node = stack.pop()
+            yield node
+            stack.extend(node.children)
+
+
+@dataclass(frozen=True)
+class SearchResult:
+    """The chosen move (None for a pass) and how much work the search did to find it"""
+
+    move: tuple[int, int] | None
+    win_rate: float
+    visits: int
+    reused_visits: int
+    tree_size: int
+    seconds: float
+
+    @property
+    def visits_per_second(self) -> float:
+        return (self.visits - self.reused_visits) / self.seconds if self.seconds else 0.0
+
+
+class MCTS:
+    """
+    Monte Carlo tree search with UCT selection and random playouts.
+
+    Nodes are widened progressively, trying their candidate moves in the order of a cheap prior (captures,
+    saving a group from atari, then moves close to the stones on the board), so that a search with few
+    visits per move on the large boards still chooses between moves it has played out more than once.
+
+    The tree is kept between calls to `search()`: the node matching the new position (by Zobrist hash
+    and player to move) becomes the root, so the playouts spent on the expected reply are not lost.
+
+    `parallel_search()` additionally runs independent searches in worker processes (root parallelization)
+    and adds their statistics of the root's moves to this tree.
+    """
+
+    def __init__(self, exploration: float = DEFAULT_EXPLORATION, komi: float = DEFAULT_KOMI, rng: random.Random | None = None) -> None:
+        self.exploration = exploration
+        self.komi = komi
+        self.rng = rng or random.Random()
+        self.root: Node | None = None
+
+    def search(self, game: GoGame, color: str, seconds: float, max_visits: int | None = None) -> SearchResult:
+        """Search the position for `color` until `seconds` have passed or the root has `max_visits` visits"""
+        start = time.perf_counter()
+        root = self._reuse_root(game, color)
+        reused_visits = root.visits
+        self._run(root, game, start + seconds, max_visits)
+        return self._result(root, reused_visits, start)
+
+    def parallel_search(
+        self, game: GoGame, color: str, seconds: float, executor: Executor, workers: int, max_visits: int | None = None
+    ) -> SearchResult:
+        """
+        Like `search()`, with `workers` additional searches running on `executor` at the same time.
+        The position is sent to them as `GoGame.to_bytes()` and only their root's move statistics come back.
+        """
+        start = time.perf_counter()
+        root = self._reuse_root(game, color)
+        reused_visits = root.visits
+        share = None if max_visits is None else max_visits // (workers + 1)
+        board = game.to_bytes()
+        futures = [
+            executor.submit(_search_worker, board, color, seconds, share, self.exploration, self.komi, self.rng.getrandbits(64))
+            for _ in range(workers)
+        ]
+        self._run(root, game, start + seconds, None if share is None else reused_visits + share)
+        for future in futures:
+            self._merge(root, future.result())
+        return self._result(root, reused_visits, start)
+
+    def _run(self, root: Node, game: GoGame, deadline: float, max_visits: int | None) -> None:
+        while time.perf_counter() < deadline and (max_visits is None or root.visits < max_visits):
+            self._iterate(root, game)
+
+    @staticmethod
+    def _merge(root: Node, stats: list[tuple[tuple[int, int] | None, int, int, int]]) -> None:
+        children = {child.move: child for child in root.children}
+        for move, position_hash, visits, wins in stats:
+            child = children.get(move)
+            if child is None:
+                child = Node(move, REVERSE[root.color], position_hash, root)
+                root.children.append(child)
+            child.visits += visits
+            child.wins += wins
+            root.visits += visits
+            root.wins += visits - wins
+        if root.untried:
+            tried = {child.move for child in root.children}
+            root.untried = [move for move in root.untried if move not in tried]
+
+    def _result(self, root: Node, reused_visits: int, start: float) -> SearchResult:
+        self.root = root
+        best = max(root.children, key=lambda child: child.visits, default=None)
+        return SearchResult(
+            move=best.move if best else None,
+            win_rate=best.wins / best.visits if best else 0.0,
+            visits=root.visits,
+            reused_visits=reused_visits,
+            tree_size=sum(1 for _ in root.subtree()),
+            seconds=time.perf_counter() - start,
+        )
+
+    def _reuse_root(self, game: GoGame, color: str) -> Node:
+        # the current position is usually two plies below the old root, after our move and the reply
+        old_root = self.root
+        if old_root is not None:
+            for node in [old_root, *old_root.children, *(grandchild for child in old_root.children for grandchild in child.children)]:
+                if node.position_hash == game.position_hash and node.color == REVERSE[color]:
+                    node.parent = None
+                    return node
+        return Node(None, REVERSE[color], game.position_hash, None)
+
+    def _iterate(self, root: Node, game: GoGame) -> None:
+        node = root
+        state = game.fork()
+        # selection
+        while node.untried is not None and node.children and not node.widens:
+            node = node.uct_child(self.exploration)
+            if node.move is not None:
+                state.place_stone(*node.move, node.color)
+        # expansion
+        if node.untried is None:
+            # children may already exist when they were merged from other searches
+            tried = {child.move for child in node.children}
+            node.untried = [move for move in self._candidate_moves(state, REVERSE[node.color]) if move not in tried]
+        if node.untried:
+            move = node.untried.pop()
+            state.place_stone(*move, REVERSE[node.color])
+            child = Node(move, REVERSE[node.color], state.position_hash, node)
+            node.children.append(child)
+            node = child
+        elif not node.children:
+            # no move left but passing, which gets a single child
+            node.children.append(Node(None, REVERSE[node.color], state.position_hash, node))
+            node = node.children[0]
+        # simulation
+        winner = random_playout(state, REVERSE[node.color], self.rng, self.komi).winner
+        # backpropagation
+        while node is not None:
+            node.visits += 1
+            if winner == node.color:
+                node.wins += 1
+            node = node.parent
+
+    def _candidate_moves(self, game: GoGame, color: str) -> list[tuple[int, int]]:
+        """Legal moves for `color`, without filling its own eyes, the most promising last and equal ones shuffled"""
+        moves = [
+            (x, y)
+            for x in range(game.size_x)
+            for y in range(game.size_y)
+            if game.color_at(x, y) is None and not game.is_eye(x, y, color) and game.is_legal(x, y, color)
+        ]
+        captures = game.last_liberties(REVERSE[color])
+        escapes = game.last_liberties(color)
+        stones = [(x, y) for x in range(game.size_x) for y in range(game.size_y) if game.color_at(x, y) is not None]
+        near_stones = {(x + dx, y + dy) for x, y in stones for dx, dy in _NEARBY}
+
+        def prior(move: tuple[int, int]) -> int:
+            if move in captures:
+                return 3
+            if move in escapes:
+                return 2
+            return 1 if move in near_stones else 0
+
+        self.rng.shuffle(moves)
+        moves.sort(key=prior)
+        return moves
+
+
+# offsets of the points within a distance of two
+_NEARBY = [(dx, dy) for dx in range(-2, 3) for dy in range(-2, 3) if abs(dx) + abs(dy) <= 2]
+
+
+def _search_worker(
+    board: bytes, color: str, seconds: float, max_visits: int | None, exploration: float, komi: float, seed: int
+) -> list[tuple[tuple[int, int] | None, int, int, int]]:
+    """Runs in a worker process of `MCTS.parallel_search()`, returns (move, position hash, visits, wins) per root move"""
+    search = MCTS(exploration, komi, random.Random(seed))
+    search.search(GoGame.from_bytes(board), color, seconds, max_visits)
+    assert search.root
+    return [(child.move, child.position_hash, child.visits, child.wins) for child in search.root.children]
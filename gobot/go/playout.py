@@ -0,0 +1,56 @@
+import random
+
+from gobot.go.go import CAPTURED, DEFAULT_KOMI, REVERSE, GameResult, GoGame
+
+
+def random_playout(
+    game: GoGame,
+    color: str,
+    rng: random.Random | None = None,
+    komi: float = DEFAULT_KOMI,
+    max_moves: int | None = None,
+) -> GameResult:
+    """
+    Play uniformly random legal moves on `game`, starting with `color`, until both players pass and score the result.
+    Moves into a player's own eyes are never played, so a player passes once only such points are left.
+    The game is changed in place, use `GoGame.fork()` to keep the original position.
+    """
+    rng = rng or random.Random()
+    points = game.size_x * game.size_y
+    max_moves = 3 * points if max_moves is None else max_moves
+    empty = [point for point in range(points) if game.color_at(*divmod(point, game.size_y)) is None]
+
+    passes = 0
+    for _ in range(max_moves):
+        if _play_random_move(game, empty, color, rng):
+            passes = 0
+        else:
+            passes += 1
+            if passes == 2:
+                break
+        color = REVERSE[color]
+    return game.calculate_result(komi)
+
+
+def _play_random_move(game: GoGame, empty: list[int], color: str, rng: random.Random) -> bool:
+    """Place a stone on a random legal point of `empty` that is no own eye, keeping `empty` up to date"""
+    size_y = game.size_y
+    candidates = len(empty)
+    while candidates:
+        i = rng.randrange(candidates)
+        x, y = divmod(empty[i], size_y)
+        if not game.is_eye(x, y, color) and game.is_legal(x, y, color):
+            game.place_stone(x, y, color)
+            empty[i] = empty[-1]
+            empty.pop()
+            # the stones captured by the move follow it in the history
+            history = game.history
+            i = len(history) - 1
+            while history[i] & 3 == CAPTURED:
+                empty.append(history[i] >> 2)
+                i -= 1
+            return True
+        # move the rejected point out of the candidate range for this turn
+        candidates -= 1
+        empty[i], empty[candidates] = empty[candidates], empty[i]
+    return False
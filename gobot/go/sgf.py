@@ -0,0 +1,197 @@
+"""
+Reading and writing game records in the Smart Game Format (https://www.red-bean.com/sgf/).
+
+The reader works on a stream in chunks and yields games and their moves as it goes, so collections
+of many thousand games can be replayed without holding the file in memory. Only the main line of
+each game is read, variations are skipped.
+"""
+
+import itertools
+import re
+from collections.abc import Iterator
+from typing import TextIO
+
+from gobot.go import strings
+from gobot.go.exceptions import SgfException
+from gobot.go.go import DEFAULT_KOMI, GameResult, GoGame, KoRule
+
+SGF_COLORS: dict[str, str] = {"B": "black", "W": "white"}
+SGF_PROPERTIES: dict[str, str] = {"black": "B", "white": "W"}
+
+# a structural character, or a property with all of its values
+_TOKEN = re.compile(r"\s*(?:([();])|([A-Za-z]+)((?:\s*\[(?:[^\]\\]|\\.)*\])+))", re.S)
+_VALUE = re.compile(r"\[((?:[^\]\\]|\\.)*)\]", re.S)
+_ESCAPE = re.compile(r"\\(?:\r\n|\n\r|\n|\r|(.))", re.S)
+# what may follow a token that the next chunk can still extend: the end of the buffer, or another (incomplete) value
+_MAY_CONTINUE = re.compile(r"\s*(?:\[|\Z)")
+
+Token = str | tuple[str, list[str]]
+
+
+class SgfGame:
+    """A game of an SGF collection, whose moves are parsed only while they are iterated"""
+
+    def __init__(self, properties: dict[str, list[str]], moves: Iterator[tuple[str, tuple[int, int] | None]]) -> None:
+        self.properties = properties
+        self.moves = moves
+
+    @property
+    def size(self) -> int:
+        return int(self.properties.get("SZ", ["19"])[0].split(":")[0])
+
+    @property
+    def komi(self) -> float:
+        try:
+            return float(self.properties["KM"][0])
+        except (KeyError, ValueError):
+            return DEFAULT_KOMI
+
+    @property
+    def setup_stones(self) -> dict[tuple[int, int], str]:
+        """Stones placed before the first move, e.g. handicap stones"""
+        stones = {}
+        for property_, color in (("AB", "black"), ("AW", "white")):
+            for value in self.properties.get(property_, []):
+                for coord in _expand_points(value):
+                    stones[coord] = color
+        return stones
+
+    def replay(self, ko_rule: KoRule = KoRule.SIMPLE) -> GoGame:
+        """Play the remaining moves on a new game"""
+        game = GoGame.from_position(self.size, self.size, self.setup_stones, ko_rule)
+        for color, coord in self.moves:
+            if coord is None:
+                game.pass_turn(color)
+            else:
+                game.place_stone(*coord, color)
+        return game
+
+
+def read_sgf(stream: TextIO, chunk_size: int = 1 << 16) -> Iterator[SgfGame]:
+    """
+    Yield the games of an SGF collection one after another. The moves of a game have to be iterated
+    before the next game is requested, any moves left unread are skipped.
+    """
+    tokens = _tokens(stream, chunk_size)
+    for token in tokens:
+        if token != "(":
+            continue
+        properties: dict[str, list[str]] = {}
+        pending: list[Token] = []
+        for token in tokens:
+            if isinstance(token, tuple) and token[0] not in SGF_COLORS:
+                properties[token[0]] = token[1]
+            elif token != ";" or properties:
+                # the root node ended, or holds a move itself
+                pending.append(token)
+                break
+        game = SgfGame(properties, iter(()))
+        # itertools.chain, unlike a generator, does not close the token stream when the moves are discarded
+        moves = game.moves = _main_line(itertools.chain(pending, tokens), game.size)
+        yield game
+        for _ in moves:
+            pass
+
+
+def write_sgf(
+    game: GoGame,
+    stream: TextIO,
+    black: str | None = None,
+    white: str | None = None,
+    komi: float = DEFAULT_KOMI,
+    result: GameResult | None = None,
+) -> None:
+    """Write the moves of `game` (and the stones it started from) as an SGF record"""
+    root = ["GM[1]FF[4]CA[UTF-8]AP[GoBot]", f"SZ[{game.size_x}]" if game.size_x == game.size_y else f"SZ[{game.size_x}:{game.size_y}]"]
+    root.append(f"KM[{komi:g}]")
+    if black:
+        root.append(f"PB[{_escape(black)}]")
+    if white:
+        root.append(f"PW[{_escape(white)}]")
+    if result:
+        root.append(f"RE[{'0' if result.winner is None else f'{result.winner[0].upper()}+{result.margin:g}'}]")
+
+    # the position before the recorded moves, for games loaded without their full history
+    start = game.fork()
+    while start.undo_stack:
+        start.undo()
+    for color, property_ in SGF_PROPERTIES.items():
+        points = [(x, y) for x in range(game.size_x) for y in range(game.size_y) if start.color_at(x, y) == color]
+        if points:
+            root.append(f"A{property_}" + "".join(f"[{_point(coord)}]" for coord in points))
+
+    stream.write("(;" + "".join(root) + "\n")
+    for i, move in enumerate(game.moves()):
+        stream.write(f";{SGF_PROPERTIES[move.color]}[{_point(move.coord) if move.coord else ''}]")
+        if i % 10 == 9:
+            stream.write("\n")
+    stream.write(")\n")
+
+
+def _main_line(tokens: Iterator[Token], size: int) -> Iterator[tuple[str, tuple[int, int] | None]]:
+    """Moves of the first variation at every branch, until the game tree is closed"""
+    depth = 1
+    following = True
+    for token in tokens:
+        if token == "(":
+            depth += 1
+        elif token == ")":
+            depth -= 1
+            # a variation that ends is the end of the main line, its siblings are skipped
+            following = False
+            if depth == 0:
+                return
+        elif isinstance(token, tuple) and following and token[0] in SGF_COLORS:
+            value = token[1][0]
+            # older SGF versions pass with "tt" on boards up to 19x19
+            is_pass = value == "" or (value == "tt" and size <= 19)
+            yield SGF_COLORS[token[0]], None if is_pass else _coord(value)
+
+
+def _tokens(stream: TextIO, chunk_size: int) -> Iterator[Token]:
+    """Split the stream into structural characters and (property, values) pairs, reading chunk by chunk"""
+    buffer = ""
+    position = 0
+    at_end = False
+    while True:
+        match = _TOKEN.match(buffer, position)
+        if not at_end and (match is None or _MAY_CONTINUE.match(buffer, match.end())):
+            chunk = stream.read(chunk_size)
+            at_end = not chunk
+            buffer = buffer[position:] + chunk
+            position = 0
+            continue
+        if match is None:
+            if buffer[position:].strip():
+                raise SgfException(f"{strings.error_invalid_sgf} {buffer[position : position + 20]!r}")
+            return
+        position = match.end()
+        if match.group(1):
+            yield match.group(1)
+        else:
+            identifier = "".join(char for char in match.group(2) if char.isupper())
+            values = [_ESCAPE.sub(lambda escape: escape.group(1) or "", value) for value in _VALUE.findall(match.group(3))]
+            yield identifier, values
+
+
+def _coord(value: str) -> tuple[int, int]:
+    return ord(value[0]) - ord("a"), ord(value[1]) - ord("a")
+
+
+def _point(coord: tuple[int, int]) -> str:
+    return chr(ord("a") + coord[0]) + chr(ord("a") + coord[1])
+
+
+def _expand_points(value: str) -> Iterator[tuple[int, int]]:
+    """A point, or all points of a rectangle given as `aa:cc`"""
+    if ":" not in value:
+        yield _coord(value)
+        return
+    (x1, y1), (x2, y2) = (_coord(corner) for corner in value.split(":"))
+    for x in range(min(x1, x2), max(x1, x2) + 1):
+        for y in range(min(y1, y2), max(y1, y2) + 1):
+            yield x, y
+
+
+def _escape(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("]", "\\]")
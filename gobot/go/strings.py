@@ -3,6 +3,9 @@ error_invalid_size = "Supported board sizes are 9x9, 13x13 and 19x19!"
 error_coord_occupied = "This coordinate already holds a stone!"
 error_self_capture = "The move is a self-capture and is not allowed!"
 error_ko = "Move not allowed because of Ko rule"
+error_nothing_to_undo = "There is no move to undo!"
+error_nothing_to_redo = "There is no move to redo!"
+error_invalid_sgf = "The SGF record could not be read at"
 
 board_9_path = "images/board_9.jpg"
 board_13_path = "images/board_13_no_numbers.jpg"
@@ -1,80 +1,96 @@
-class Vec2(object):
-    def __init__(self, x=0, y=0):
-        self.x = x
-        self.y = y
-        self._map_add = {float: self.add_num, int: self.add_num, Vec2: self.add_point, tuple: self.add_tuple}
-        self._map_sub = {float: self.sub_num, int: self.sub_num, Vec2: self.sub_point, tuple: self.sub_tuple}
-        self._map_eq = {Vec2: self.eq_point, tuple: self.eq_tuple}
-        self._map_mul = {float: self.scale, int: self.scale, Vec2: self.dot, tuple: self.dot_tuple}
-        self._map_div = {float: self.div_num, int: self.div_num, Vec2: self.div_point, tuple: self.div_tuple}
-
-    def __add__(self, point):
-        return self._map_add[type(point)](point)
-
-    def add_num(self, num):
-        return Vec2(self.x + num, self.y + num)
-
-    def add_point(self, point):
-        return Vec2(self.x + point.x, self.y + point.y)
-
-    def add_tuple(self, tup):
-        x, y = tup
-        return Vec2(self.x + x, self.y + y)
+from collections.abc import Callable, Iterable, Iterator
+from typing import TYPE_CHECKING, Any
 
-    def __sub__(self, point):
-        return self._map_sub[type(point)](point)
+if TYPE_CHECKING:
+    import numpy
 
-    def sub_num(self, num):
-        return Vec2(self.x - num, self.y - num)
 
-    def sub_point(self, point):
-        return Vec2(self.x - point.x, self.y - point.y)
+class Vec2:
+    """
+    An immutable 2D vector. Arithmetic works element-wise with another Vec2, a tuple of two numbers,
+    or a single number applied to both elements.
+    """
 
-    def sub_tuple(self, tup):
-        x, y = tup
-        return Vec2(self.x - x, self.y - y)
+    __slots__ = ("x", "y")
 
-    def __eq__(self, point):
-        return self._map_eq[type(point)](point)
+    # how each supported operand type is split into its x and y part, shared by all instances
+    _operands: dict[type, Callable[[Any], tuple[Any, Any]]]
 
-    def eq_point(self, point):
-        return self.x == point.x and self.y == point.y
+    x: float
+    y: float
 
-    def eq_tuple(self, tup):
-        x, y = tup
-        return self.x == x and self.y == y
+    def __init__(self, x: float = 0, y: float = 0):
+        object.__setattr__(self, "x", x)
+        object.__setattr__(self, "y", y)
 
-    def __ne__(self, point):
-        return self.x != point.x or self.y != point.y
+    def __setattr__(self, name, value):
+        raise AttributeError("Vec2 is immutable")
 
-    def __mul__(self, obj):
-        return self._map_mul[type(obj)](obj)
+    def __delattr__(self, name):
+        raise AttributeError("Vec2 is immutable")
 
-    def scale(self, scalar):
-        return Vec2(self.x * scalar, self.y * scalar)
+    def __add__(self, other):
+        if (split := self._operands.get(type(other))) is None:
+            return NotImplemented
+        x, y = split(other)
+        return Vec2(self.x + x, self.y + y)
 
-    def dot(self, point):
-        return Vec2(self.x * point.x, self.y * point.y)
+    def __sub__(self, other):
+        if (split := self._operands.get(type(other))) is None:
+            return NotImplemented
+        x, y = split(other)
+        return Vec2(self.x - x, self.y - y)
 
-    def dot_tuple(self, tup):
-        x, y = tup
+    def __mul__(self, other):
+        if (split := self._operands.get(type(other))) is None:
+            return NotImplemented
+        x, y = split(other)
         return Vec2(self.x * x, self.y * y)
 
-    def __truediv__(self, point):
-        return self._map_div[type(point)](point)
-
-    def div_point(self, point):
-        return Vec2(self.x / point.x, self.y / point.y)
+    def __truediv__(self, other):
+        if (split := self._operands.get(type(other))) is None:
+            return NotImplemented
+        x, y = split(other)
+        return Vec2(self.x / x, self.y / y)
 
-    def div_num(self, num):
-        return Vec2(self.x / num, self.y / num)
+    def __eq__(self, other):
+        # only vectors and tuples compare, a number equal to both elements does not
+        if type(other) is not Vec2 and type(other) is not tuple:
+            return NotImplemented
+        return tuple(self) == tuple(other)
 
-    def div_tuple(self, tup):
-        x, y = tup
-        return Vec2(self.x / x, self.y / y)
+    def __hash__(self):
+        # equal to the hash of the tuple, as the two compare equal
+        return hash((self.x, self.y))
 
-    def __iter__(self):
+    def __iter__(self) -> Iterator:
         return iter((self.x, self.y))
 
+    def __reduce__(self):
+        return Vec2, (self.x, self.y)
+
     def __str__(self):
         return "({}, {})".format(self.x, self.y)
+
+    def __repr__(self):
+        return "Vec2({!r}, {!r})".format(self.x, self.y)
+
+    @staticmethod
+    def to_array(vectors: Iterable["Vec2"]) -> "numpy.ndarray":
+        """The vectors as NumPy array of shape (n, 2), for geometry over many points at once"""
+        import numpy
+
+        return numpy.array([(vector.x, vector.y) for vector in vectors], dtype=float).reshape(-1, 2)
+
+    @staticmethod
+    def from_array(array: "numpy.ndarray") -> list["Vec2"]:
+        """The rows of an array of shape (n, 2) as vectors of Python numbers"""
+        return [Vec2(x, y) for x, y in array.tolist()]
+
+
+Vec2._operands = {
+    int: lambda number: (number, number),
+    float: lambda number: (number, number),
+    tuple: lambda pair: pair,
+    Vec2: lambda vector: (vector.x, vector.y),
+}
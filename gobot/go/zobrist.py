@@ -0,0 +1,26 @@
+import random
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class ZobristKeys:
+    """Random 64 bit keys whose XOR over all stones on the board identifies a position"""
+
+    empty_board: int
+    stones: tuple[tuple[int, ...], ...]  # indexed by [color][point], color 0 (empty) is all zeros
+    white_to_move: int
+
+
+def zobrist_keys(size_x: int, size_y: int) -> ZobristKeys:
+    # seeded per size so that hashes are stable across processes and differ between board sizes
+    rng = random.Random(f"gobot-zobrist-{size_x}x{size_y}")
+    points = size_x * size_y
+    return ZobristKeys(
+        empty_board=rng.getrandbits(64),
+        stones=(
+            (0,) * points,
+            tuple(rng.getrandbits(64) for _ in range(points)),
+            tuple(rng.getrandbits(64) for _ in range(points)),
+        ),
+        white_to_move=rng.getrandbits(64),
+    )
@@ -17,6 +17,10 @@ logger = logging.getLogger(__name__)
 GAMES_TABLE_NAME = "gobot_games"
 
 
+def _coord_from_db(value: str) -> tuple[int, int]:
+    return tuple(int(x) for x in value.split(","))  # type:ignore
+
+
 def to_db_format(game: TelegramGoGame) -> dict[str, Any]:
     """Convert a TelegramGoGame to dict format for DynamoDB"""
     db_board = {}
@@ -40,6 +44,7 @@ def to_db_format(game: TelegramGoGame) -> dict[str, Any]:
         "last_stone": f"{game.last_stone_placed[0]},{game.last_stone_placed[1]}" if game.last_stone_placed else None,
         "last_capt_stone": f"{game.last_captured_single_stone[0]},{game.last_captured_single_stone[1]}" if game.last_captured_single_stone else None,
         "board": db_board,
+        "history": game.history_bytes(),
     }
     if len(game.players) > 1:
         player2 = game.players[1]
@@ -73,14 +78,14 @@ def to_domain(game_state: dict[str, Any]) -> TelegramGoGame:
     if player2_id and player2_name:
         game.players.append(Player(player2_id, player2_name, PlayerColor.BLACK, player2_passed))
     game.current_player_index = int(game_state["turn_player_index"])
-    game.last_stone_placed = tuple(int(x) for x in last_stone.split(",")) if last_stone else None  # type:ignore
 
     board = game_state["board"]
-    for coord in board:
-        x, y = [int(val) for val in coord.split(",")]
-        color = board[coord]
-        game.place_stone(x, y, color)
-    # this has to be set last to not be overwritten by the stone placements
+    game.load_position({_coord_from_db(coord): color for coord, color in board.items()})
+    if history := game_state.get("history"):
+        # DynamoDB resource returns Binary objects for bytes
+        game.load_history(bytes(getattr(history, "value", history)))
+    # these have to be set last to not be overwritten by loading the position
+    game.last_stone_placed = tuple(int(x) for x in last_stone.split(",")) if last_stone else None  # type:ignore
     game.last_captured_single_stone = tuple(int(x) for x in last_capt_stone.split(",")) if last_capt_stone else None  # type:ignore
 
     return game
@@ -1,7 +1,9 @@
 import logging
 
+from pydantic import Field, PositiveInt
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
+from gobot.go.image_format import ImageFormat
 from gobot.persistence.persistence_factory import DBs
 
 logger = logging.getLogger(__name__)
@@ -22,6 +24,18 @@ class Settings(BaseSettings):
     USE_LOCAL_DB: bool = False
     DYNAMODB_ENDPOINT: str | None = None
 
+    # search time per bot move, leaving room for loading, rendering and replying within the 15s Lambda timeout
+    BOT_THINKING_SECONDS: float = Field(default=5.0, gt=0, le=10)
+    # additional processes searching in parallel, AWS Lambda lacks the shared memory they need so keep it at 0 there
+    BOT_SEARCH_WORKERS: int = Field(default=0, ge=0)
+
+    # encoding of the board images, see benchmarks/go/image_encoding_bench_test.py for the trade-offs
+    IMAGE_FORMAT: ImageFormat = ImageFormat.JPEG
+    IMAGE_QUALITY: int = Field(default=75, ge=1, le=100)
+    IMAGE_PALETTE_COLORS: int | None = Field(default=None, ge=2, le=256)
+    # image width and height in pixels per board size, e.g. {"19": 600}
+    IMAGE_RESOLUTIONS: dict[int, PositiveInt] = {}
+
 
 _settings: Settings | None = None
 
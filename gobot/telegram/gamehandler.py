@@ -1,10 +1,26 @@
+import io
+import logging
 import random
+from concurrent.futures import ProcessPoolExecutor
 from typing import Literal, overload
 
+from gobot import settings
+from gobot.go.go import GameResult
+from gobot.go.mcts import MCTS
+from gobot.go.sgf import write_sgf
 from gobot.persistence import persistence_factory
 from gobot.telegram import proverbs
+from gobot.telegram.player import BOT_PLAYER_ID, BOT_PLAYER_NAME
+from gobot.telegram.player_color import PlayerColor
 from gobot.telegram.telegram_go_game import TelegramGoGame
 
+logger = logging.getLogger(__name__)
+
+# search trees of running bot games, kept across warm invocations so the next move can reuse them
+MAX_CACHED_SEARCHES = 32
+_searches: dict[int, MCTS] = {}
+_search_executor: ProcessPoolExecutor | None = None
+
 
 class GameHandlerException(Exception):
     pass
@@ -23,7 +39,7 @@ class GameHandler:
             raise GameHandlerException("Please start a game with /new first!")
         return game
 
-    def new_game(self, chat_id: int, player_id: int, player_name: str, board_size: int = 9) -> TelegramGoGame:
+    def new_game(self, chat_id: int, player_id: int, player_name: str, board_size: int = 9, against_bot: bool = False) -> TelegramGoGame:
         old_game = self.get_game_with_chat_id(chat_id)
         if old_game is not None:
             check_if_participating_player(player_id, old_game)
@@ -36,7 +52,11 @@ class GameHandler:
             board_x=board_size,
             board_y=board_size,
         )
+        if against_bot:
+            # the bot takes white, so the human player makes the first move
+            new_game.add_player(BOT_PLAYER_ID, BOT_PLAYER_NAME)
         new_game.add_player(player_id, player_name)
+        _searches.pop(chat_id, None)
         self.DB.new_game(new_game)
         return new_game
 
@@ -69,16 +89,91 @@ class GameHandler:
         self.DB.update_game(game)
         return game
 
-    def calculate_result(self, chat_id: int):
-        # TODO
-        raise NotImplementedError()
-        game = self._get_game_with_chat_id(chat_id)
+    def undo(self, chat_id: int, player_id: int) -> TelegramGoGame:
+        game = self.get_game_with_chat_id(chat_id, raise_if_not_found=True)
+        check_if_enough_players(game)
+        check_if_participating_player(player_id, game)
+        if game.has_bot and not game.is_bot_turn and game.undo_stack:
+            bot = game.players[(game.current_player_index + 1) % 2]
+            if game.undo_stack[-1].color == bot.color:
+                # take back the bot's reply together with the player's move
+                game.undo()
+        check_if_last_move_by_player(player_id, game)
+
+        game.undo()
+        self.DB.update_game(game)
+        return game
+
+    def play_bot_move(self, chat_id: int) -> tuple[TelegramGoGame, tuple[int, int] | None]:
+        """Let the bot search for and play its move, returning the game and the move (None for a pass)"""
+        game = self.get_game_with_chat_id(chat_id, raise_if_not_found=True)
+        if not game.is_bot_turn:
+            raise GameHandlerException("It is not my turn!")
+        assert game.current_player
+        color = game.current_player.color
+
+        opponent = game.players[(game.current_player_index + 1) % 2]
+        move: tuple[int, int] | None = None
+        if not (opponent.did_pass and game.calculate_result().winner == color):
+            seconds = settings.get_settings().BOT_THINKING_SECONDS
+            workers = settings.get_settings().BOT_SEARCH_WORKERS
+            if workers:
+                result = self._search(chat_id).parallel_search(game, color, seconds, _get_search_executor(workers), workers)
+            else:
+                result = self._search(chat_id).search(game, color, seconds)
+            logger.info(
+                f"Bot search | chat={chat_id} visits={result.visits} reused={result.reused_visits} tree={result.tree_size} "
+                f"visits/s={result.visits_per_second:.0f} win_rate={result.win_rate:.2f}"
+            )
+            move = result.move
+            # other updates of the chat may have been handled during the search, never overwrite them
+            stored = self.get_game_with_chat_id(chat_id)
+            if (
+                stored is None
+                or stored.history != game.history
+                or stored.players != game.players
+                or stored.current_player_index != game.current_player_index
+            ):
+                raise GameHandlerException("The game changed while I was thinking, so I will not play my move.")
+
+        if move is None:
+            game.pass_turn()
+        else:
+            game.place_stone_str_coord(game.to_str_coord(*move))
+        self.DB.update_game(game)
+        return game, move
+
+    @staticmethod
+    def _search(chat_id: int) -> MCTS:
+        if chat_id not in _searches:
+            if len(_searches) >= MAX_CACHED_SEARCHES:
+                _searches.pop(next(iter(_searches)))
+            _searches[chat_id] = MCTS()
+        return _searches[chat_id]
+
+    def sgf_record(self, chat_id: int) -> str:
+        game = self.get_game_with_chat_id(chat_id, raise_if_not_found=True)
+        names = {player.color: player.name for player in game.players}
+        record = io.StringIO()
+        write_sgf(game, record, black=names.get(PlayerColor.BLACK), white=names.get(PlayerColor.WHITE))
+        return record.getvalue()
+
+    def calculate_result(self, chat_id: int) -> GameResult:
+        game = self.get_game_with_chat_id(chat_id, raise_if_not_found=True)
         return game.calculate_result()
 
     def remove_game(self, chat_id: int) -> None:
+        _searches.pop(chat_id, None)
         self.DB.delete_game(chat_id)
 
 
+def _get_search_executor(workers: int) -> ProcessPoolExecutor:
+    global _search_executor
+    if _search_executor is None:
+        _search_executor = ProcessPoolExecutor(max_workers=workers)
+    return _search_executor
+
+
 def check_if_participating_player(player_id: int, game: TelegramGoGame) -> None:
     if player_id not in [player.id_ for player in game.players]:
         raise GameHandlerException("You are not part of a current game and therefore not allowed to perform this action!")
@@ -95,3 +190,11 @@ def check_if_player_turn(player_id: int, game: TelegramGoGame) -> None:
 def check_if_enough_players(game: TelegramGoGame) -> None:
     if not game.has_enough_players():
         raise GameHandlerException("Another player needs to join the game with /join!")
+
+
+def check_if_last_move_by_player(player_id: int, game: TelegramGoGame) -> None:
+    """Only the player who placed the last stone may take it back, as long as the opponent has not played since"""
+    previous_player = game.players[(game.current_player_index + 1) % 2]
+    last_move = game.undo_stack[-1] if game.undo_stack else None
+    if last_move is None or player_id != previous_player.id_ or last_move.color != previous_player.color:
+        raise GameHandlerException("You can only take back your own last move!")
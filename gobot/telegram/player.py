@@ -2,10 +2,18 @@ from dataclasses import dataclass
 
 from gobot.telegram.player_color import PlayerColor
 
+# the engine playing in /bot games, no Telegram user has this id
+BOT_PLAYER_ID = 0
+BOT_PLAYER_NAME = "Go Sensei"
 
-@dataclass
+
+@dataclass(slots=True)
 class Player:
     id_: int
     name: str
     color: PlayerColor
     did_pass: bool = False
+
+    @property
+    def is_bot(self) -> bool:
+        return self.id_ == BOT_PLAYER_ID
@@ -7,6 +7,8 @@ from gobot.telegram.player_color import PlayerColor
 
 
 class TelegramGoGame(GoGame):
+    __slots__ = ("chat_id", "players", "current_player_index")
+
     def __init__(self, chat_id: int, board_x: int, board_y: int) -> None:
         super().__init__(board_x, board_y)
         self.chat_id = chat_id
@@ -24,6 +26,14 @@ class TelegramGoGame(GoGame):
             return None
         return self.players[self.current_player_index]
 
+    @property
+    def has_bot(self) -> bool:
+        return any(player.is_bot for player in self.players)
+
+    @property
+    def is_bot_turn(self) -> bool:
+        return self.current_player is not None and self.current_player.is_bot
+
     def add_player(self, player_id: int, player_name: str) -> None:
         is_first_player = not self.players
         color = PlayerColor.WHITE if is_first_player else PlayerColor.BLACK
@@ -37,8 +47,18 @@ class TelegramGoGame(GoGame):
         self.current_player.did_pass = False
         self._change_turn()
 
-    def pass_turn(self) -> None:
+    @override
+    def undo(self) -> None:
+        super().undo()
+        self._change_turn()
+        if self.redo_stack[-1].coord is None:
+            assert self.current_player
+            self.current_player.did_pass = False
+
+    @override
+    def pass_turn(self, color: str | None = None) -> None:
         assert self.current_player
+        super().pass_turn(self.current_player.color)
         self.current_player.did_pass = True
         self._change_turn()
 
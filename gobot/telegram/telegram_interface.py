@@ -1,3 +1,4 @@
+import asyncio
 import html
 import logging
 import random
@@ -7,9 +8,11 @@ from telegram.ext import Application, ApplicationBuilder, CommandHandler, Contex
 
 from gobot import settings
 from gobot.go.exceptions import KoException
-from gobot.go.goscreenshot import take_in_memory_screenshot
+from gobot.go.go import GameResult
+from gobot.go.goscreenshot import ImageEncoding, take_in_memory_screenshot
 from gobot.telegram import proverbs
 from gobot.telegram.gamehandler import GameHandler, TelegramGoGame
+from gobot.telegram.player import BOT_PLAYER_NAME
 
 logger = logging.getLogger(__name__)
 game_handler: GameHandler
@@ -19,7 +22,9 @@ def setup_app() -> Application:
     global game_handler
 
     logger.info("Setting up Telegram interface")
-    application = ApplicationBuilder().token(settings.get_settings().TOKEN).build()
+    # when polling, updates of other chats are handled while the bot searches for a move
+    # (on AWS Lambda every invocation handles a single update anyway)
+    application = ApplicationBuilder().token(settings.get_settings().TOKEN).concurrent_updates(True).build()
 
     game_handler = GameHandler()
 
@@ -28,10 +33,13 @@ def setup_app() -> Application:
         [
             CommandHandler(["start", "s"], _start_command),
             CommandHandler(["new", "n"], _new_game_command),
+            CommandHandler(["bot", "b"], _bot_command),
             CommandHandler(["join", "j"], _join_command),
             CommandHandler(["place", "p"], _place_command, has_args=True),
             CommandHandler(["pass"], _pass_turn_command),
+            CommandHandler(["undo", "u"], _undo_command),
             CommandHandler(["show", "sh"], _show_board_command),
+            CommandHandler(["sgf"], _sgf_command),
             CommandHandler(["proverb", "pr"], _display_proverb_command),
             MessageHandler(filters.COMMAND, _unknown_command),
         ]
@@ -83,10 +91,13 @@ async def _start_command(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
             "These are my available commands:<br>"
             "  /start - to show this introductory message<br>"
             "  /new - start a new 9x9 game<br>"
+            "  /bot - start a new 9x9 game against me<br>"
             "  /join - join an already created game<br>"
             "  /place <i>coords</i> - play a stone of your color at given coordinates (e.g. <code>/place a1</code>)<br>"
             "  /pass - to skip your turn<br>"
+            "  /undo - take back your last move<br>"
             "  /show - show the current board state<br>"
+            "  /sgf - download the game record as an SGF file<br>"
             "  /proverb - display a proverb"
         ),
     )
@@ -113,6 +124,28 @@ async def _new_game_command(update: Update, context: ContextTypes.DEFAULT_TYPE)
         await send_message(context.bot, chat_id, html.escape(str(e)))
 
 
+async def _bot_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    assert update.effective_chat
+    assert update.message
+    assert update.message.from_user
+
+    chat_id = update.effective_chat.id
+    user_id = update.message.from_user.id
+    user_name = update.message.from_user.name.replace("'", "")
+    board_size = 9
+    if context.args:
+        board_size = int(context.args[0])
+    logger.info(f"Command: /bot | chat={chat_id} user={user_name}")
+
+    try:
+        game = game_handler.new_game(chat_id, user_id, user_name, board_size, against_bot=True)
+        await send_message(context.bot, chat_id, "<b>You started a game against me!</b> You play black, so you have the first move.")
+        await _show_board_command(update, context, game)
+        await _show_turn(context.bot, chat_id, game)
+    except Exception as e:
+        await send_message(context.bot, chat_id, html.escape(str(e)))
+
+
 async def _join_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     assert update.effective_chat
     assert update.message
@@ -149,6 +182,9 @@ async def _place_command(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
     try:
         game = game_handler.place_stone(chat_id, user_id, coords)
         await _show_board_command(update, context, game)
+        if game.is_bot_turn:
+            await _play_bot_move(update, context)
+            return
         await _show_turn(context.bot, chat_id, game)
     except KoException as e:
         await send_message(context.bot, chat_id, html.escape(str(e)))
@@ -173,16 +209,63 @@ async def _pass_turn_command(update: Update, context: ContextTypes.DEFAULT_TYPE)
             await _game_over(context.bot, chat_id)
             return
         await send_message(context.bot, chat_id, f"Player {html.escape(user_name)} passed")
+        if game.is_bot_turn:
+            await _play_bot_move(update, context)
+            return
         await _show_board_command(update, context, game)
         await _show_turn(context.bot, chat_id, game)
     except Exception as e:
         await send_message(context.bot, chat_id, html.escape(str(e)))
 
 
+async def _undo_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    assert update.effective_chat
+    assert update.message
+    assert update.message.from_user
+
+    chat_id = update.effective_chat.id
+    user_id = update.message.from_user.id
+    user_name = update.message.from_user.name.replace("'", "")
+    logger.info(f"Command: /undo | chat={chat_id} user={user_name}")
+
+    try:
+        game = game_handler.undo(chat_id, user_id)
+        await send_message(context.bot, chat_id, f"Player {html.escape(user_name)} took back their last move")
+        await _show_board_command(update, context, game)
+        await _show_turn(context.bot, chat_id, game)
+    except Exception as e:
+        await send_message(context.bot, chat_id, html.escape(str(e)))
+
+
+async def _play_bot_move(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    assert update.effective_chat
+
+    chat_id = update.effective_chat.id
+    # the search takes a while, run it off the event loop so the updates handled concurrently are answered meanwhile
+    game, move = await asyncio.to_thread(game_handler.play_bot_move, chat_id)
+    if game.is_game_over:
+        await _game_over(context.bot, chat_id)
+        return
+    if move is None:
+        await send_message(context.bot, chat_id, f"{BOT_PLAYER_NAME} passed")
+    else:
+        await send_message(context.bot, chat_id, f"{BOT_PLAYER_NAME} played {game.to_str_coord(*move)}")
+    await _show_board_command(update, context, game)
+    await _show_turn(context.bot, chat_id, game)
+
+
 async def _game_over(bot: Bot, chat_id: int) -> None:
-    # TODO: score = game_handler.calculate_result(chat_id)
+    result = game_handler.calculate_result(chat_id)
     game_handler.remove_game(chat_id)
     await send_message(bot, chat_id, "The game is over. Well played!")
+    await send_message(bot, chat_id, format_result(result))
+
+
+def format_result(result: GameResult) -> str:
+    scores = f"Black: {result.black:g} points\nWhite: {result.white:g} points (including {result.komi:g} komi)"
+    if result.winner is None:
+        return f"{scores}\n<b>The game is a draw!</b>"
+    return f"{scores}\n<b>{result.winner.capitalize()} wins by {result.margin:g} points!</b>"
 
 
 # board_id: int = 0
@@ -199,7 +282,7 @@ async def _show_board_command(update: Update, context: ContextTypes.DEFAULT_TYPE
     game = game_ or game_handler.get_game_with_chat_id(chat_id, raise_if_not_found=True)
 
     try:
-        image = take_in_memory_screenshot(game)
+        image = take_in_memory_screenshot(game, chat_id, _image_encoding())
         """
         board_id += 1
         with open(f"state_{board_id}.jpg", "wb") as f:
@@ -210,6 +293,27 @@ async def _show_board_command(update: Update, context: ContextTypes.DEFAULT_TYPE
         await send_message(context.bot, chat_id, str(e))
 
 
+def _image_encoding() -> ImageEncoding:
+    settings_ = settings.get_settings()
+    return ImageEncoding(settings_.IMAGE_FORMAT, settings_.IMAGE_QUALITY, settings_.IMAGE_PALETTE_COLORS, settings_.IMAGE_RESOLUTIONS)
+
+
+async def _sgf_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    assert update.effective_chat
+    assert update.message
+    assert update.message.from_user
+
+    chat_id = update.effective_chat.id
+    user_name = update.message.from_user.name.replace("'", "")
+    logger.info(f"Command: /sgf | chat={chat_id} user={user_name}")
+
+    try:
+        record = game_handler.sgf_record(chat_id)
+        await context.bot.send_document(chat_id, document=record.encode(), filename=f"game_{chat_id}.sgf")
+    except Exception as e:
+        await send_message(context.bot, chat_id, html.escape(str(e)))
+
+
 async def _show_turn(bot: Bot, chat_id: int, game: TelegramGoGame) -> None:
     if game.current_player is None:
         return
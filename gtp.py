@@ -0,0 +1,188 @@
+import argparse
+import logging
+import sys
+from collections.abc import Callable
+from typing import TextIO
+
+from gobot.go.exceptions import GoGameException
+from gobot.go.go import DEFAULT_KOMI, SUPPORTED_SIZES, GoGame
+from gobot.go.mcts import MCTS
+from gobot.log_utils import LOG_FORMAT
+
+logger = logging.getLogger(__name__)
+
+# GTP skips the letter I in board columns, and counts rows from the bottom
+GTP_COLUMNS = "ABCDEFGHJKLMNOPQRST"
+GTP_COLORS: dict[str, str] = {"b": "black", "black": "black", "w": "white", "white": "white"}
+
+
+class GtpException(Exception):
+    pass
+
+
+class GtpEngine:
+    """Go Text Protocol (version 2) front end for GoGame, with genmove backed by the MCTS bot"""
+
+    def __init__(self, seconds: float = 1.0) -> None:
+        self.seconds = seconds
+        self.komi = DEFAULT_KOMI
+        self.game = GoGame(19, 19)
+        self.search = MCTS(komi=self.komi)
+        self.running = True
+        self.commands: dict[str, Callable[[list[str]], str]] = {
+            "protocol_version": lambda args: "2",
+            "name": lambda args: "GoBot",
+            "version": lambda args: "1.0",
+            "known_command": lambda args: str(bool(args) and args[0] in self.commands).lower(),
+            "list_commands": lambda args: "\n".join(self.commands),
+            "quit": self._quit,
+            "boardsize": self._boardsize,
+            "clear_board": self._clear_board,
+            "komi": self._komi,
+            "play": self._play,
+            "genmove": self._genmove,
+            "undo": self._undo,
+            "final_score": self._final_score,
+            "showboard": self._showboard,
+        }
+
+    def handle(self, line: str) -> str | None:
+        """The response to one line of input, None for empty and comment lines"""
+        line = "".join(char for char in line.split("#")[0] if char.isprintable() or char == "\t").replace("\t", " ")
+        words = line.split()
+        if not words:
+            return None
+        id_ = ""
+        if words[0].isdigit():
+            id_ = words.pop(0)
+        if not words:
+            return None
+        command, args = words[0].lower(), words[1:]
+
+        if command not in self.commands:
+            return f"?{id_} unknown command\n\n"
+        try:
+            return f"={id_} {self.commands[command](args)}".rstrip(" ") + "\n\n"
+        except (GtpException, GoGameException) as e:
+            return f"?{id_} {e}\n\n"
+
+    def run(self, input_: TextIO, output: TextIO) -> None:
+        for line in input_:
+            response = self.handle(line)
+            if response is not None:
+                output.write(response)
+                output.flush()
+            if not self.running:
+                break
+
+    def _quit(self, args: list[str]) -> str:
+        self.running = False
+        return ""
+
+    def _boardsize(self, args: list[str]) -> str:
+        size = self._int(args)
+        if (size, size) not in SUPPORTED_SIZES:
+            raise GtpException("unacceptable size")
+        self.game = GoGame(size, size)
+        self.search = MCTS(komi=self.komi)
+        return ""
+
+    def _clear_board(self, args: list[str]) -> str:
+        self.game = GoGame(self.game.size_x, self.game.size_y)
+        self.search = MCTS(komi=self.komi)
+        return ""
+
+    def _komi(self, args: list[str]) -> str:
+        try:
+            self.komi = float(args[0])
+        except (IndexError, ValueError):
+            raise GtpException("syntax error")
+        self.search.komi = self.komi
+        return ""
+
+    def _play(self, args: list[str]) -> str:
+        if len(args) < 2:
+            raise GtpException("syntax error")
+        color = self._color(args[0])
+        coord = self._vertex(args[1])
+        try:
+            if coord is None:
+                self.game.pass_turn(color)
+            else:
+                self.game.place_stone(*coord, color)
+        except GoGameException:
+            raise GtpException("illegal move")
+        return ""
+
+    def _genmove(self, args: list[str]) -> str:
+        color = self._color(args[0] if args else "")
+        result = self.search.search(self.game, color, self.seconds)
+        logger.info(f"genmove {color} | visits={result.visits} visits/s={result.visits_per_second:.0f} win_rate={result.win_rate:.2f}")
+        if result.move is None:
+            self.game.pass_turn(color)
+            return "pass"
+        self.game.place_stone(*result.move, color)
+        return self._to_vertex(*result.move)
+
+    def _undo(self, args: list[str]) -> str:
+        try:
+            self.game.undo()
+        except GoGameException:
+            raise GtpException("cannot undo")
+        return ""
+
+    def _final_score(self, args: list[str]) -> str:
+        result = self.game.calculate_result(self.komi)
+        if result.winner is None:
+            return "0"
+        return f"{result.winner[0].upper()}+{result.margin:g}"
+
+    def _showboard(self, args: list[str]) -> str:
+        size = self.game.size_x
+        columns = GTP_COLUMNS[:size]
+        symbols = {None: ".", "black": "X", "white": "O"}
+        rows = [f"   {' '.join(columns)}"]
+        for y in range(self.game.size_y):
+            row = size - y
+            stones = " ".join(symbols[self.game.color_at(x, y)] for x in range(size))
+            rows.append(f"{row:2} {stones} {row}")
+        rows.append(rows[0])
+        return "\n" + "\n".join(rows)
+
+    def _vertex(self, vertex: str) -> tuple[int, int] | None:
+        vertex = vertex.upper()
+        if vertex == "PASS":
+            return None
+        size = self.game.size_x
+        if len(vertex) < 2 or vertex[0] not in GTP_COLUMNS[:size] or not vertex[1:].isdigit() or not 1 <= int(vertex[1:]) <= size:
+            raise GtpException("invalid coordinate")
+        return GTP_COLUMNS.index(vertex[0]), size - int(vertex[1:])
+
+    def _to_vertex(self, x: int, y: int) -> str:
+        return f"{GTP_COLUMNS[x]}{self.game.size_y - y}"
+
+    @staticmethod
+    def _color(color: str) -> str:
+        if color.lower() not in GTP_COLORS:
+            raise GtpException("invalid color")
+        return GTP_COLORS[color.lower()]
+
+    @staticmethod
+    def _int(args: list[str]) -> int:
+        if not args or not args[0].isdigit():
+            raise GtpException("syntax error")
+        return int(args[0])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the GoBot engine as a GTP engine on stdin/stdout")
+    parser.add_argument("--seconds", type=float, default=1.0, help="search time per generated move")
+    args = parser.parse_args()
+
+    # stdout belongs to the protocol
+    logging.basicConfig(stream=sys.stderr, format=LOG_FORMAT, level=logging.INFO)
+    GtpEngine(args.seconds).run(sys.stdin, sys.stdout)
+
+
+if __name__ == "__main__":
+    main()
@@ -27,6 +27,9 @@ class GoBotStack(Stack):
             log_retention=logs.RetentionDays.ONE_WEEK,
             architecture=_lambda.Architecture.ARM_64,
             timeout=Duration.seconds(15),
+            # about 75 MB for the interpreter and libraries, plus the board image and search tree caches of warm
+            # invocations (see docs/dev.md); Lambda also assigns CPU in proportion, which speeds up the /bot search
+            memory_size=512,
         )
 
         dynamodb_table = dynamodb.Table(
@@ -0,0 +1,25 @@
+from typing import Any
+
+from gobot.persistence.dynamodb import to_db_format, to_domain
+from gobot.persistence.persistence_port import PersistencePort
+from gobot.telegram.telegram_go_game import TelegramGoGame
+
+
+class FakeDB(PersistencePort):
+    """Keeps the items DynamoDB would store in memory, converting them the same way"""
+
+    def __init__(self) -> None:
+        self.items: dict[int, dict[str, Any]] = {}
+
+    def new_game(self, game: TelegramGoGame) -> None:
+        self.update_game(game)
+
+    def load_game(self, chat_id: int) -> TelegramGoGame | None:
+        item = self.items.get(chat_id)
+        return None if item is None else to_domain(item)
+
+    def update_game(self, game: TelegramGoGame) -> None:
+        self.items[game.chat_id] = to_db_format(game)
+
+    def delete_game(self, chat_id: int) -> None:
+        self.items.pop(chat_id, None)
@@ -1,13 +1,21 @@
+import random
+import tracemalloc
+
 import pytest
 
 from gobot.go.exceptions import (
     CoordOccupiedException,
+    GoGameException,
     InvalidBoardSizeException,
     InvalidCoordinateException,
     KoException,
+    NothingToRedoException,
+    NothingToUndoException,
     SelfCaptureException,
 )
-from gobot.go.go import GoGame, GridPosition
+from gobot.go.go import NEIGHBOR_TABLES, GoGame, GridPosition, KoRule
+from gobot.persistence.dynamodb import to_db_format, to_domain
+from gobot.telegram.telegram_go_game import TelegramGoGame
 
 
 class TestGridPosition:
@@ -21,6 +29,27 @@ class TestGridPosition:
         assert not grid_pos.is_free
 
 
+class TestNeighborTables:
+    def test_tables_shared_between_games(self):
+        assert GoGame(19, 19)._neighbors is GoGame(19, 19)._neighbors
+        assert GoGame(9, 9)._neighbors is NEIGHBOR_TABLES[(9, 9)]
+
+    def test_neighbor_counts(self):
+        for (size_x, size_y), table in NEIGHBOR_TABLES.items():
+            assert len(table) == size_x * size_y
+            assert len(table[0]) == 2  # corner
+            assert len(table[1]) == 3  # edge
+            assert len(table[size_y + 1]) == 4  # center
+
+    def test_neighbors_are_adjacent(self):
+        table = NEIGHBOR_TABLES[(13, 13)]
+        for point, neighbors in enumerate(table):
+            x, y = divmod(point, 13)
+            assert {divmod(neighbor, 13) for neighbor in neighbors} == {
+                (nx, ny) for nx, ny in [(x - 1, y), (x + 1, y), (x, y - 1), (x, y + 1)] if 0 <= nx < 13 and 0 <= ny < 13
+            }
+
+
 class TestGoGame:
     @staticmethod
     def coord(x: int, y: int) -> str:
@@ -141,3 +170,534 @@ class TestGoGame:
 
         with pytest.raises(KoException):
             game.place_stone_str_coord(self.coord(0, 0), "white")
+
+    def test_color_at(self):
+        game = GoGame(9, 9)
+        game.place_stone(2, 3, "white")
+        assert game.color_at(2, 3) == "white"
+        assert game.color_at(3, 2) is None
+
+    def test_board_view(self):
+        game = GoGame(13, 13)
+        game.place_stone(12, 0, "black")
+        assert len(game.board) == 13
+        assert all(len(column) == 13 for column in game.board)
+        assert game.board[12][0].color == "black"
+        with pytest.raises(IndexError):
+            game.board[13]
+
+    def test_liberties(self):
+        game = GoGame(9, 9)
+        game.place_stone(0, 0, "white")
+        assert game.board[0][0].liberties == {(1, 0), (0, 1)}
+        game.place_stone(1, 0, "white")
+        assert game.board[0][0].liberties == {(0, 1), (1, 1), (2, 0)}
+        game.place_stone(1, 1, "black")
+        assert game.board[1][0].liberties == {(0, 1), (2, 0)}
+        assert game.board[1][1].liberties == {(0, 1), (2, 1), (1, 2)}
+
+    def test_liberties_after_capture(self):
+        game = GoGame(9, 9)
+        game.place_stone(0, 0, "white")
+        game.place_stone(1, 0, "black")
+        game.place_stone(0, 1, "black")
+        assert game.board[0][0].is_free
+        assert (0, 0) in game.board[1][0].liberties
+        assert (0, 0) in game.board[0][1].liberties
+
+    def test_liberties_random_game(self):
+        game = GoGame(9, 9)
+        rng = random.Random(42)
+        colors = ["black", "white"]
+        for move in range(400):
+            try:
+                game.place_stone(rng.randrange(9), rng.randrange(9), colors[move % 2])
+            except GoGameException:
+                continue
+        for x in range(9):
+            for y in range(9):
+                if game.board[x][y].is_free:
+                    continue
+                expected = set()
+                for sx, sy in game.board[x][y].group:
+                    for nx, ny in [(sx - 1, sy), (sx + 1, sy), (sx, sy - 1), (sx, sy + 1)]:
+                        if 0 <= nx < 9 and 0 <= ny < 9 and game.board[nx][ny].is_free:
+                            expected.add((nx, ny))
+                assert game.board[x][y].liberties == expected
+
+    def test_position_hash_independent_of_move_order(self):
+        game1 = GoGame(9, 9)
+        game1.place_stone(2, 2, "black")
+        game1.place_stone(6, 6, "white")
+        game2 = GoGame(9, 9)
+        game2.place_stone(6, 6, "white")
+        game2.place_stone(2, 2, "black")
+        assert game1.position_hash == game2.position_hash
+        assert game1.position_hash != GoGame(9, 9).position_hash
+
+    def test_position_hash_differs_between_sizes(self):
+        assert GoGame(9, 9).position_hash != GoGame(13, 13).position_hash
+
+    def test_position_hash_after_capture(self):
+        game = GoGame(9, 9)
+        game.place_stone(1, 0, "black")
+        before_white = game.position_hash
+        game.place_stone(0, 0, "white")
+        game.place_stone(0, 1, "black")
+        assert game.board[0][0].is_free
+        game2 = GoGame(9, 9)
+        game2.place_stone(1, 0, "black")
+        game2.place_stone(0, 1, "black")
+        assert game.position_hash == game2.position_hash
+        assert game.position_hash != before_white
+
+    def test_positional_superko(self):
+        game = GoGame(9, 9, ko_rule=KoRule.POSITIONAL_SUPERKO)
+        game.place_stone(0, 0, "white")
+        game.place_stone(2, 0, "white")
+        game.place_stone(1, 1, "white")
+        game.place_stone(0, 1, "black")
+        game.place_stone(1, 0, "black")
+        assert game.board[0][0].is_free
+
+        with pytest.raises(KoException):
+            game.place_stone(0, 0, "white")
+
+    def test_situational_superko(self):
+        game = GoGame(9, 9, ko_rule=KoRule.SITUATIONAL_SUPERKO)
+        moves = [(0, 1), (2, 0), (5, 5), (1, 1), (6, 6), (0, 0), (1, 0)]
+        for i, (x, y) in enumerate(moves):
+            game.place_stone(x, y, ["black", "white"][i % 2])
+        assert game.board[0][0].is_free
+
+        with pytest.raises(KoException):
+            game.place_stone(0, 0, "white")
+
+    def test_situational_superko_other_player_to_move(self):
+        """The same position with the other player to move is a different situation"""
+        game = GoGame(9, 9, ko_rule=KoRule.SITUATIONAL_SUPERKO)
+        game.place_stone(0, 0, "white")
+        game.place_stone(2, 0, "white")
+        game.place_stone(1, 1, "white")
+        game.place_stone(0, 1, "black")
+        game.place_stone(1, 0, "black")
+
+        game.place_stone(0, 0, "white")
+        assert game.board[1][0].is_free
+
+    @staticmethod
+    def snapshot(game: GoGame):
+        stones = {}
+        for x, column in enumerate(game.board):
+            for y, grid_pos in enumerate(column):
+                if not grid_pos.is_free:
+                    stones[(x, y)] = (grid_pos.color, frozenset(grid_pos.group), frozenset(grid_pos.liberties))
+        return stones, game.position_hash, game.last_stone_placed, game.last_captured_single_stone
+
+    def test_undo_capture(self):
+        game = GoGame(9, 9)
+        game.place_stone_str_coord(self.coord(5, 5), "white")
+        game.place_stone_str_coord(self.coord(5, 4), "black")
+        game.place_stone_str_coord(self.coord(5, 6), "black")
+        game.place_stone_str_coord(self.coord(4, 5), "black")
+        before = self.snapshot(game)
+        game.place_stone_str_coord(self.coord(6, 5), "black")
+        assert game.board[5][5].is_free
+
+        game.undo()
+        assert self.snapshot(game) == before
+        assert game.board[5][5].color == "white"
+        assert game.board[5][5].liberties == {(6, 5)}
+
+    def test_undo_ko(self):
+        game = GoGame(9, 9)
+        game.place_stone_str_coord(self.coord(0, 0), "white")
+        game.place_stone_str_coord(self.coord(2, 0), "white")
+        game.place_stone_str_coord(self.coord(1, 1), "white")
+        game.place_stone_str_coord(self.coord(0, 1), "black")
+        game.place_stone_str_coord(self.coord(1, 0), "black")
+        with pytest.raises(KoException):
+            game.place_stone_str_coord(self.coord(0, 0), "white")
+
+        game.undo()
+        assert game.board[0][0].color == "white"
+        assert game.board[1][0].is_free
+        assert game.last_captured_single_stone is None
+        game.place_stone_str_coord(self.coord(1, 0), "black")
+        assert game.board[0][0].is_free
+
+    def test_undo_redo_random_game(self):
+        game = GoGame(9, 9)
+        rng = random.Random(7)
+        snapshots = [self.snapshot(game)]
+        for move in range(300):
+            try:
+                game.place_stone_str_coord(self.coord(rng.randrange(9), rng.randrange(9)), ["black", "white"][move % 2])
+            except GoGameException:
+                continue
+            snapshots.append(self.snapshot(game))
+
+        for snapshot in reversed(snapshots[:-1]):
+            game.undo()
+            assert self.snapshot(game) == snapshot
+        for snapshot in snapshots[1:]:
+            game.redo()
+            assert self.snapshot(game) == snapshot
+
+    def test_nothing_to_undo(self):
+        game = GoGame(9, 9)
+        with pytest.raises(NothingToUndoException):
+            game.undo()
+        with pytest.raises(NothingToRedoException):
+            game.redo()
+
+    def test_place_stone_clears_redo(self):
+        game = GoGame(9, 9)
+        game.place_stone(3, 3, "black")
+        game.undo()
+        game.place_stone(4, 4, "black")
+        with pytest.raises(NothingToRedoException):
+            game.redo()
+
+    def test_last_stone_placed_without_str_coord(self):
+        game = GoGame(9, 9)
+        game.place_stone(4, 6, "black")
+        assert game.last_stone_placed == (4, 6)
+
+    def test_ko_without_str_coord(self):
+        game = GoGame(9, 9)
+        game.place_stone(0, 0, "white")
+        game.place_stone(2, 0, "white")
+        game.place_stone(1, 1, "white")
+        game.place_stone(0, 1, "black")
+        game.place_stone(1, 0, "black")
+        game.place_stone(5, 5, "white")  # a move elsewhere after a single capture is no ko
+        assert game.board[5][5].color == "white"
+
+    def test_legal_moves_empty_board(self):
+        game = GoGame(9, 9)
+        assert game.legal_moves("black") == (1 << 81) - 1
+
+    def test_legal_moves_excludes_occupied_and_self_capture(self):
+        game = GoGame(9, 9)
+        game.place_stone(1, 0, "black")
+        game.place_stone(0, 1, "black")
+        legal = game.legal_moves("white")
+        assert not legal & (1 << 0)  # self-capture in the corner
+        assert not legal & (1 << 1)  # occupied
+        assert not legal & (1 << 9)  # occupied
+        assert bin(legal).count("1") == 81 - 3
+        assert game.legal_moves("black") & (1 << 0)
+
+    def test_legal_moves_excludes_ko(self):
+        game = GoGame(9, 9)
+        game.place_stone(0, 0, "white")
+        game.place_stone(2, 0, "white")
+        game.place_stone(1, 1, "white")
+        game.place_stone(0, 1, "black")
+        game.place_stone(1, 0, "black")
+        assert not game.is_legal(0, 0, "white")
+        assert not game.legal_moves("white") & (1 << 0)
+
+    def test_last_liberties(self):
+        game = GoGame(9, 9)
+        game.place_stone(0, 0, "white")
+        game.place_stone(1, 0, "black")
+        game.place_stone(4, 4, "white")
+        game.place_stone(4, 5, "black")
+        game.place_stone(4, 3, "black")
+        game.place_stone(3, 4, "black")
+        assert game.last_liberties("white") == {(0, 1), (5, 4)}
+        assert game.last_liberties("black") == set()
+
+    def test_is_legal_out_of_board(self):
+        game = GoGame(9, 9)
+        assert not game.is_legal(9, 0, "black")
+        assert not game.is_legal(0, -1, "black")
+
+    @pytest.mark.parametrize("ko_rule", list(KoRule))
+    def test_is_legal_matches_place_stone(self, ko_rule):
+        game = GoGame(9, 9, ko_rule=ko_rule)
+        rng = random.Random(3)
+        colors = ["black", "white"]
+        for move in range(200):
+            color = colors[move % 2]
+            legal = game.legal_moves(color)
+            for x in range(9):
+                for y in range(9):
+                    try:
+                        game.place_stone(x, y, color)
+                    except GoGameException:
+                        assert not game.is_legal(x, y, color)
+                        assert not legal & (1 << (x * 9 + y))
+                        continue
+                    game.undo()
+                    assert legal & (1 << (x * 9 + y))
+            candidates = [point for point in range(81) if legal & (1 << point)]
+            if not candidates:
+                break
+            game.place_stone(*divmod(rng.choice(candidates), 9), color)
+
+    def test_result_empty_board(self):
+        result = GoGame(9, 9).calculate_result()
+        assert result.black == 0
+        assert result.white == 7.5
+        assert result.winner == "white"
+        assert result.margin == 7.5
+
+    def test_result_territory(self):
+        game = GoGame(9, 9)
+        for y in range(9):
+            game.place_stone(3, y, "black")
+            game.place_stone(4, y, "white")
+        result = game.calculate_result(komi=0)
+        assert result.black == 4 * 9
+        assert result.white == 5 * 9
+        assert result.winner == "white"
+
+    def test_result_neutral_points(self):
+        game = GoGame(9, 9)
+        for y in range(9):
+            game.place_stone(3, y, "black")
+            game.place_stone(5, y, "white")
+        game.place_stone(4, 0, "black")
+        game.place_stone(4, 8, "white")
+        result = game.calculate_result(komi=0.5)
+        # the dame column between the walls touches both colors
+        assert result.black == 4 * 9 + 1
+        assert result.white == 4 * 9 + 1 + 0.5
+        assert result.winner == "white"
+        assert result.margin == 0.5
+
+    def test_result_draw(self):
+        game = GoGame(9, 9)
+        game.place_stone(4, 4, "black")
+        game.place_stone(0, 0, "white")
+        assert game.calculate_result(komi=0).winner is None
+
+    def test_from_position(self):
+        game = GoGame(9, 9)
+        rng = random.Random(11)
+        for move in range(300):
+            try:
+                game.place_stone(rng.randrange(9), rng.randrange(9), ["black", "white"][move % 2])
+            except GoGameException:
+                continue
+        stones = {(x, y): game.color_at(x, y) for x in range(9) for y in range(9) if game.color_at(x, y)}
+
+        loaded = GoGame.from_position(9, 9, stones)  # type: ignore
+
+        played_stones, played_hash, _, _ = self.snapshot(game)
+        loaded_stones, loaded_hash, last_stone, last_captured = self.snapshot(loaded)
+        assert loaded_stones == played_stones
+        assert loaded_hash == played_hash
+        assert last_stone is None
+        assert last_captured is None
+        assert not loaded.undo_stack
+
+    def test_load_position_replaces_board(self):
+        game = GoGame(9, 9)
+        game.place_stone(0, 0, "black")
+        game.load_position({(1, 1): "white", (1, 2): "white"})
+        assert game.board[0][0].is_free
+        assert game.board[1][1].group == {(1, 1), (1, 2)}
+        assert game.position_hash == GoGame.from_position(9, 9, {(1, 2): "white", (1, 1): "white"}).position_hash
+
+    @staticmethod
+    def play_random(game: GoGame, rng: random.Random, moves: int) -> list[tuple[int, int, str]]:
+        played = []
+        for move in range(moves):
+            color = ["black", "white"][move % 2]
+            legal = game.legal_moves(color)
+            candidates = [point for point in range(game.size_x * game.size_y) if legal & (1 << point)]
+            if not candidates:
+                break
+            x, y = divmod(rng.choice(candidates), game.size_y)
+            game.place_stone(x, y, color)
+            played.append((x, y, color))
+        return played
+
+    def test_fork_is_independent(self):
+        game = GoGame(9, 9)
+        rng = random.Random(5)
+        history = self.play_random(game, rng, 60)
+        before = self.snapshot(game)
+
+        fork = game.fork()
+        fork_moves = self.play_random(fork, rng, 60)
+        assert self.snapshot(game) == before
+
+        game_moves = self.play_random(game, rng, 60)
+        for moves, played in [(history + fork_moves, fork), (history + game_moves, game)]:
+            replayed = GoGame(9, 9)
+            for x, y, color in moves:
+                replayed.place_stone(x, y, color)
+            assert self.snapshot(played) == self.snapshot(replayed)
+
+    def test_fork_of_fork(self):
+        game = GoGame(9, 9)
+        rng = random.Random(9)
+        self.play_random(game, rng, 40)
+        fork = game.fork()
+        fork2 = fork.fork()
+        before = self.snapshot(fork)
+        self.play_random(fork2, rng, 40)
+        assert self.snapshot(fork) == before
+
+    def test_fork_undo(self):
+        game = GoGame(9, 9)
+        game.place_stone(1, 0, "black")
+        game.place_stone(0, 0, "white")
+        fork = game.fork()
+        fork.place_stone(0, 1, "black")
+        assert fork.board[0][0].is_free
+        fork.undo()
+        fork.undo()
+        assert fork.board[0][0].is_free
+        assert fork.board[1][0].color == "black"
+        assert game.board[0][0].color == "white"
+
+    def test_fork_superko_history(self):
+        game = GoGame(9, 9, ko_rule=KoRule.POSITIONAL_SUPERKO)
+        game.place_stone(0, 0, "white")
+        game.place_stone(2, 0, "white")
+        game.place_stone(1, 1, "white")
+        game.place_stone(0, 1, "black")
+        fork = game.fork()
+        fork.place_stone(1, 0, "black")
+        with pytest.raises(KoException):
+            fork.place_stone(0, 0, "white")
+        assert game.is_legal(1, 0, "black")
+
+    def test_bytes_round_trip(self):
+        game = GoGame(13, 13, ko_rule=KoRule.POSITIONAL_SUPERKO)
+        self.play_random(game, random.Random(11), 80)
+        data = game.to_bytes()
+        restored = GoGame.from_bytes(data)
+        assert len(data) < 13 * 13 + 8 * 81 + 16
+        assert restored.ko_rule == KoRule.POSITIONAL_SUPERKO
+        assert self.snapshot(restored) == self.snapshot(game)
+        assert restored.legal_moves("black") == game.legal_moves("black")
+        assert restored.legal_moves("white") == game.legal_moves("white")
+
+    def test_bytes_round_trip_keeps_ko(self):
+        game = GoGame(9, 9)
+        game.place_stone(1, 0, "black")
+        game.place_stone(2, 0, "white")
+        game.place_stone(0, 1, "black")
+        game.place_stone(1, 1, "white")
+        game.place_stone(0, 0, "white")
+        restored = GoGame.from_bytes(game.to_bytes())
+        assert restored.last_stone_placed == (0, 0)
+        assert restored.last_captured_single_stone == (1, 0)
+        assert not restored.is_legal(1, 0, "black")
+
+    @pytest.mark.parametrize("moves", [150, 250])
+    def test_memory_budget(self, moves):
+        # a busy 19x19 game with its move history, as loaded from the database on every request
+        source = GoGame(19, 19)
+        self.play_random(source, random.Random(12), moves)
+        stored = TelegramGoGame(chat_id=1, board_x=19, board_y=19)
+        stored.add_player(1, "white")
+        stored.add_player(2, "black")
+        stored.load_position({(x, y): color for x in range(19) for y in range(19) if (color := source.color_at(x, y))})
+        stored.load_history(source.history_bytes())
+        item = to_db_format(stored)
+
+        tracemalloc.start()
+        try:
+            games = [to_domain(item) for _ in range(20)]
+            allocated, _ = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        assert len(games[-1].undo_stack) == moves
+        assert allocated / 20 < 64 * 1024
+
+    def test_history_records_moves_passes_and_captures(self):
+        game = GoGame(9, 9)
+        game.place_stone(1, 0, "black")
+        game.place_stone(0, 0, "white")
+        game.pass_turn("white")
+        game.place_stone(0, 1, "black")
+        assert list(game.history) == [(1 * 9 + 0) << 2 | 1, 0 << 2 | 2, 81 << 2 | 2, 1 << 2 | 1, 0 << 2 | 3]
+        moves = list(game.moves())
+        assert [(move.coord, move.color, move.captured) for move in moves] == [
+            ((1, 0), "black", []),
+            ((0, 0), "white", []),
+            (None, "white", []),
+            ((0, 1), "black", [(0, 0)]),
+        ]
+        assert [(move.last_stone_placed, move.last_captured_single_stone) for move in moves] == [
+            (move.last_stone_placed, move.last_captured_single_stone) for move in game.undo_stack
+        ]
+
+    def test_undo_redo_pass(self):
+        game = GoGame(9, 9)
+        game.place_stone(4, 4, "black")
+        game.pass_turn("white")
+        game.undo()
+        assert len(game.history) == 1
+        assert game.undo_stack[-1].coord == (4, 4)
+        game.redo()
+        assert game.undo_stack[-1].coord is None
+        assert len(game.history) == 2
+
+    def test_undo_truncates_capture_markers(self):
+        game = GoGame(9, 9)
+        for x, y, color in [(1, 0, "black"), (0, 0, "white"), (0, 1, "black")]:
+            game.place_stone(x, y, color)
+        game.undo()
+        assert list(game.history) == [(1 * 9 + 0) << 2 | 1, 0 << 2 | 2]
+
+    def test_undo_stack_decodes_from_the_top(self):
+        game = GoGame(9, 9)
+        self.play_random(game, random.Random(15), 80)
+        game.pass_turn("black")
+
+        def fields(move):
+            return move.coord, move.color, move.captured, move.last_stone_placed, move.last_captured_single_stone
+
+        moves = [fields(move) for move in game.moves()]
+        assert len(game.undo_stack) == len(moves)
+        assert [fields(move) for move in reversed(game.undo_stack)] == moves[::-1]
+        assert [fields(game.undo_stack[i]) for i in (0, 5, -1, -7)] == [moves[i] for i in (0, 5, -1, -7)]
+        with pytest.raises(IndexError):
+            game.undo_stack[len(moves)]
+
+    def test_undo_restores_ko_state_of_restored_position(self):
+        game = GoGame(9, 9)
+        game.place_stone(1, 0, "black")
+        game.place_stone(2, 0, "white")
+        game.place_stone(0, 1, "black")
+        game.place_stone(1, 1, "white")
+        game.place_stone(0, 0, "white")
+        restored = GoGame.from_bytes(game.to_bytes())
+        restored.place_stone(5, 5, "black")
+        restored.undo()
+        assert restored.last_stone_placed == (0, 0)
+        assert restored.last_captured_single_stone == (1, 0)
+        assert not restored.is_legal(1, 0, "black")
+
+    def test_history_size(self):
+        game = GoGame(19, 19)
+        self.play_random(game, random.Random(13), 300)
+        captures = sum(len(move.captured) for move in game.undo_stack)
+        assert len(game.history_bytes()) == 2 * (300 + captures)
+
+    def test_load_history(self):
+        game = GoGame(13, 13, ko_rule=KoRule.POSITIONAL_SUPERKO)
+        self.play_random(game, random.Random(14), 120)
+        game.pass_turn("black")
+        stones = {(x, y): color for x in range(13) for y in range(13) if (color := game.color_at(x, y))}
+
+        restored = GoGame.from_position(13, 13, stones, ko_rule=KoRule.POSITIONAL_SUPERKO)
+        restored.load_history(game.history_bytes())
+        assert self.snapshot(restored) == self.snapshot(game)
+        assert restored.legal_moves("white") == game.legal_moves("white")
+        assert [(move.coord, move.color, move.captured) for move in restored.undo_stack] == [
+            (move.coord, move.color, move.captured) for move in game.undo_stack
+        ]
+        for _ in range(121):
+            restored.undo()
+        assert all(restored.color_at(x, y) is None for x in range(13) for y in range(13))
+        assert restored.position_hash == GoGame(13, 13).position_hash
@@ -0,0 +1,104 @@
+import random
+from unittest.mock import patch
+
+import pytest
+from PIL import Image
+
+from gobot.go import goscreenshot
+from gobot.go.go import GoGame
+from gobot.go.goscreenshot import ImageEncoding, ImageFormat, board_template, take_in_memory_screenshot, take_screenshot
+from gobot.go.playout import random_playout
+
+
+class TestScreenshot:
+    @pytest.mark.parametrize("size", [9, 13, 19])
+    def test_board_template_decoded_once(self, size):
+        assert board_template(size) is board_template(size)
+
+    def test_render_leaves_template_untouched(self):
+        template = board_template(9).image.tobytes()
+        game = GoGame(9, 9)
+        game.place_stone_str_coord("e5", "black")
+
+        image = take_screenshot(game)
+
+        assert image.tobytes() != template
+        assert board_template(9).image.tobytes() == template
+
+    @pytest.mark.parametrize("color", ["black", "white"])
+    def test_stone_sprites_anti_aliased(self, color):
+        histogram = board_template(19).stones[color].getchannel("A").histogram()
+
+        assert histogram[0] and histogram[255]
+        assert sum(1 for count in histogram[1:255] if count) > 0
+
+    # at 200 and 400 pixels the boxes of neighboring stones overlap
+    @pytest.mark.parametrize("size, resolution", [(9, None), (9, 200), (13, 600), (19, 400)])
+    def test_incremental_render_matches_full_render(self, size, resolution):
+        game = GoGame(size, size)
+        rng = random.Random(0)
+        # long enough for many captures
+        for move in range(120):
+            if move % 10 == 9:
+                game.undo()
+            else:
+                color = ["black", "white"][move % 2]
+                legal = game.legal_moves(color)
+                game.place_stone(*divmod(rng.choice([point for point in range(size * size) if legal >> point & 1]), size), color)
+
+            incremental = take_screenshot(game, key="incremental", resolution=resolution)
+
+            assert incremental.tobytes() == take_screenshot(game, resolution=resolution).tobytes()
+
+    def test_overlapping_stones_detected(self):
+        assert not board_template(19).stones_overlap
+        assert board_template(19, 400).stones_overlap
+
+    def test_incremental_render_after_size_change(self):
+        game = GoGame(9, 9)
+        game.place_stone_str_coord("e5", "black")
+        take_screenshot(game, key="size_change")
+        game = GoGame(13, 13)
+        game.place_stone_str_coord("c3", "white")
+
+        assert take_screenshot(game, key="size_change").tobytes() == take_screenshot(game).tobytes()
+
+    def test_frame_cache_bounded_by_bytes(self):
+        game = GoGame(9, 9)
+        game.place_stone_str_coord("e5", "black")
+        image = take_screenshot(game)
+        frame_bytes = image.width * image.height * 3
+
+        with patch.object(goscreenshot, "_frames", {}), patch.object(goscreenshot, "MAX_CACHED_FRAME_BYTES", 3 * frame_bytes):
+            for chat in range(5):
+                take_screenshot(game, key=chat)
+
+            assert list(goscreenshot._frames) == [2, 3, 4]
+
+    def test_render_creates_no_vectors(self):
+        game = GoGame(19, 19)
+        random_playout(game, "black", random.Random(0), max_moves=200)
+        # the template is built once, with vectors
+        take_screenshot(game)
+
+        with patch("gobot.go.goscreenshot.Vec2", side_effect=AssertionError("Vec2 created while rendering")):
+            take_screenshot(game)
+
+    @pytest.mark.parametrize("format_", list(ImageFormat))
+    def test_encoding(self, format_):
+        game = GoGame(13, 13)
+        game.place_stone_str_coord("c3", "white")
+        encoding = ImageEncoding(format_, quality=60, palette_colors=None if format_ == ImageFormat.JPEG else 32, resolutions={13: 400})
+
+        with Image.open(take_in_memory_screenshot(game, encoding=encoding)) as image:
+            assert image.format == format_
+            assert image.size == (400, 400)
+
+    def test_jpeg_has_no_palette(self):
+        with pytest.raises(ValueError):
+            ImageEncoding(ImageFormat.JPEG, palette_colors=64)
+
+    @pytest.mark.parametrize("resolution", [0, -400])
+    def test_resolution_must_be_positive(self, resolution):
+        with pytest.raises(ValueError):
+            ImageEncoding(resolutions={19: resolution})
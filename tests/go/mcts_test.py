@@ -0,0 +1,90 @@
+import random
+from concurrent.futures import ProcessPoolExecutor
+
+from gobot import settings
+from gobot.go.go import GoGame
+from gobot.go.mcts import MCTS
+
+
+class TestMCTS:
+    def test_search_returns_legal_move(self):
+        game = GoGame(9, 9)
+        game.place_stone(4, 4, "black")
+        result = MCTS(rng=random.Random(1)).search(game, "white", seconds=10, max_visits=100)
+        assert result.move is not None
+        assert game.is_legal(*result.move, "white")
+        assert result.visits == 100
+        assert result.tree_size > 1
+        assert result.visits_per_second > 0
+
+    def test_search_wins_capturing_race(self):
+        # the big black group and both white groups share their last liberty at (6, 4)
+        stones = {(x, y): "black" for x in range(6) for y in range(9)}
+        stones |= {(6, y): "white" for y in range(9) if y != 4} | {(7, y): "black" for y in range(9) if y != 4}
+        game = GoGame.from_position(9, 9, stones)
+        result = MCTS(rng=random.Random(2)).search(game, "white", seconds=10, max_visits=300)
+        assert result.move == (6, 4)
+
+    def test_search_19x19_compares_moves_within_default_budget(self):
+        # a few dozen visits on slow machines, which must not all go to different moves
+        seconds = settings.Settings.model_fields["BOT_THINKING_SECONDS"].default
+        game = GoGame(19, 19)
+        game.place_stone(3, 3, "black")
+        search = MCTS(rng=random.Random(7))
+        result = search.search(game, "white", seconds=seconds)
+        assert search.root is not None
+        best = max(search.root.children, key=lambda child: child.visits)
+        assert best.move == result.move
+        assert best.visits >= 3
+        assert len(search.root.children) < result.visits / 2
+
+    def test_search_prefers_captures_and_nearby_moves(self):
+        # white's stone at (1, 1) is in atari, capturing it is the first move tried
+        stones = {(1, 1): "white", (0, 1): "black", (1, 0): "black", (2, 1): "black", (9, 9): "white"}
+        search = MCTS(rng=random.Random(8))
+        search.search(GoGame.from_position(19, 19, stones), "black", seconds=10, max_visits=10)
+        assert search.root is not None
+        tried = [child.move for child in search.root.children if child.move is not None]
+        assert tried[0] == (1, 2)
+        assert all(min(abs(x - sx) + abs(y - sy) for sx, sy in stones) <= 2 for x, y in tried)
+
+    def test_search_passes_without_moves(self):
+        # black only has its own eyes left to play on
+        stones = {(x, y): "black" for x in range(9) for y in range(9) if (x + y) % 3 != 0 or x % 2}
+        game = GoGame.from_position(9, 9, stones)
+        result = MCTS(rng=random.Random(3)).search(game, "black", seconds=10, max_visits=10)
+        assert result.move is None
+
+    def test_tree_is_reused_after_reply(self):
+        game = GoGame(9, 9)
+        search = MCTS(rng=random.Random(4))
+        result = search.search(game, "black", seconds=10, max_visits=300)
+        assert result.move is not None
+        game.place_stone(*result.move, "black")
+        assert search.root is not None
+        reply = max(next(child for child in search.root.children if child.move == result.move).children, key=lambda child: child.visits)
+        assert reply.move is not None
+        game.place_stone(*reply.move, "white")
+        reply_visits = reply.visits
+
+        result = search.search(game, "black", seconds=10, max_visits=reply_visits + 10)
+        assert result.reused_visits == reply_visits
+        assert search.root is reply
+        assert search.root.parent is None
+
+    def test_unknown_position_starts_new_tree(self):
+        search = MCTS(rng=random.Random(5))
+        search.search(GoGame(9, 9), "black", seconds=10, max_visits=20)
+        result = search.search(GoGame.from_position(9, 9, {(0, 0): "black", (8, 8): "white"}), "black", seconds=10, max_visits=20)
+        assert result.reused_visits == 0
+
+    def test_parallel_search_merges_worker_statistics(self):
+        game = GoGame(9, 9)
+        search = MCTS(rng=random.Random(6))
+        with ProcessPoolExecutor(max_workers=2) as executor:
+            result = search.parallel_search(game, "black", seconds=10, executor=executor, workers=2, max_visits=300)
+        assert result.visits == 300
+        assert search.root is not None
+        assert sum(child.visits for child in search.root.children) == 300
+        assert len({child.move for child in search.root.children}) == len(search.root.children)
+        assert result.move is not None and game.is_legal(*result.move, "black")
@@ -0,0 +1,38 @@
+import random
+
+from gobot.go.go import GoGame
+from gobot.go.playout import random_playout
+
+
+class TestRandomPlayout:
+    def test_playout_ends_with_only_eyes_left(self):
+        for size in [9, 13, 19]:
+            game = GoGame(size, size)
+            random_playout(game, "black", random.Random(size))
+            for x in range(size):
+                for y in range(size):
+                    if game.color_at(x, y) is None:
+                        assert game.is_eye(x, y, "black") or game.is_eye(x, y, "white") or not game.is_legal(x, y, "black")
+
+    def test_playout_result(self):
+        game = GoGame(9, 9)
+        result = random_playout(game, "black", random.Random(1), komi=0.5)
+        assert result.black + result.white == 81 + 0.5
+        assert result.winner in ("black", "white")
+
+    def test_playout_is_deterministic_with_seed(self):
+        result1 = random_playout(GoGame(9, 9), "black", random.Random(4))
+        result2 = random_playout(GoGame(9, 9), "black", random.Random(4))
+        assert result1 == result2
+
+    def test_playout_on_fork_keeps_position(self):
+        game = GoGame(9, 9)
+        game.place_stone(4, 4, "black")
+        random_playout(game.fork(), "white", random.Random(2))
+        assert game.color_at(4, 4) == "black"
+        assert sum(game.color_at(x, y) is not None for x in range(9) for y in range(9)) == 1
+
+    def test_max_moves(self):
+        game = GoGame(19, 19)
+        random_playout(game, "black", random.Random(3), max_moves=10)
+        assert len(game.undo_stack) <= 10
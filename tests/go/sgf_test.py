@@ -0,0 +1,98 @@
+import io
+import random
+
+import pytest
+
+from gobot.go.exceptions import SgfException
+from gobot.go.go import GoGame
+from gobot.go.sgf import read_sgf, write_sgf
+
+
+class ChunkCountingStream(io.StringIO):
+    def __init__(self, text: str) -> None:
+        super().__init__(text)
+        self.reads = 0
+
+    def read(self, size: int | None = -1) -> str:
+        self.reads += 1
+        return super().read(size)
+
+
+class TestSgf:
+    @staticmethod
+    def random_game(size: int, moves: int, seed: int) -> GoGame:
+        game = GoGame(size, size)
+        rng = random.Random(seed)
+        color = "black"
+        for _ in range(moves):
+            legal = game.legal_moves(color)
+            points = [point for point in range(size * size) if legal & (1 << point)]
+            game.place_stone(*divmod(rng.choice(points), size), color)
+            color = "white" if color == "black" else "black"
+        return game
+
+    def test_write_read_round_trip(self):
+        game = self.random_game(13, 120, 1)
+        game.pass_turn("white")
+        record = io.StringIO()
+        write_sgf(game, record, black="Alice", white="B]ob")
+
+        sgf_game = next(read_sgf(io.StringIO(record.getvalue())))
+        assert sgf_game.size == 13
+        assert sgf_game.properties["PB"] == ["Alice"]
+        assert sgf_game.properties["PW"] == ["B]ob"]
+        replayed = sgf_game.replay()
+        assert replayed.history == game.history
+        assert replayed.position_hash == game.position_hash
+
+    def test_write_loaded_position(self):
+        game = GoGame.from_position(9, 9, {(2, 2): "black", (6, 6): "white"})
+        game.place_stone(4, 4, "black")
+        record = io.StringIO()
+        write_sgf(game, record)
+        assert "AB[cc]AW[gg]" in record.getvalue()
+        assert ";B[ee])" in record.getvalue()
+
+    def test_read_main_line_only(self):
+        record = "(;GM[1]SZ[9]KM[6.5]AB[aa:ab]AW[cc]\n;B[dd](;W[ee];B[ff](;W[]))(;W[gg];B[hh]))"
+        game = next(read_sgf(io.StringIO(record)))
+        assert game.komi == 6.5
+        assert game.setup_stones == {(0, 0): "black", (0, 1): "black", (2, 2): "white"}
+        assert list(game.moves) == [("black", (3, 3)), ("white", (4, 4)), ("black", (5, 5)), ("white", None)]
+
+    def test_read_escaped_values(self):
+        game = next(read_sgf(io.StringIO("(;C[a \\] b\\\nc]PB[x\\\\];B[tt])")))
+        assert game.properties["C"] == ["a ] bc"]
+        assert game.properties["PB"] == ["x\\"]
+        assert list(game.moves) == [("black", None)]
+
+    def test_read_collection_in_chunks(self):
+        records = []
+        for seed in range(5):
+            record = io.StringIO()
+            write_sgf(self.random_game(9, 40, seed), record)
+            records.append(record.getvalue())
+        stream = ChunkCountingStream("".join(records))
+
+        games = read_sgf(stream, chunk_size=16)
+        first = next(games)
+        assert next(first.moves) == ("black", self.random_game(9, 1, 0).undo_stack[0].coord)
+        assert stream.reads < len(records[0]) // 16 + 2
+        # unread moves are skipped when the next game is requested
+        histories = [game.replay().history for game in games]
+        assert histories == [self.random_game(9, 40, seed).history for seed in range(1, 5)]
+
+    @pytest.mark.parametrize("chunk_size", range(1, 40))
+    def test_read_setup_stones_across_chunks(self, chunk_size):
+        record = "(;GM[1]SZ[9]AB[aa][bb]\n [cc]AW[dd:de];B[ff];W[gg])(;SZ[9];B[hh])"
+
+        games = read_sgf(io.StringIO(record), chunk_size=chunk_size)
+        first = next(games)
+        assert first.setup_stones == {(0, 0): "black", (1, 1): "black", (2, 2): "black", (3, 3): "white", (3, 4): "white"}
+        assert list(first.moves) == [("black", (5, 5)), ("white", (6, 6))]
+        assert [list(game.moves) for game in games] == [[("black", (7, 7))]]
+
+    def test_read_invalid_record(self):
+        games = read_sgf(io.StringIO("(;SZ[9];B[aa]W[bb"))
+        with pytest.raises(SgfException):
+            list(next(games).moves)
@@ -0,0 +1,151 @@
+"""
+Worst-case positions for the engine, each with a ceiling on how long the expensive operations may take.
+The ceilings are far above the measured times so that slow CI machines pass, but catch anything going quadratic.
+"""
+
+import time
+from collections.abc import Callable
+
+import pytest
+
+from gobot.go.exceptions import SelfCaptureException
+from gobot.go.go import COLOR_CODES, GoGame, KoRule
+from gobot.persistence.dynamodb import to_db_format, to_domain
+from gobot.telegram.telegram_go_game import TelegramGoGame
+
+PLACE_STONE_CEILING = 0.01
+SELF_CAPTURE_CEILING = 0.01  # for checking every empty point of the board for both colors
+TO_DOMAIN_CEILING = 0.05
+
+# a worst-case game, with the move stressing the engine most and its color
+Position = Callable[[], tuple[GoGame, tuple[int, int], str]]
+
+
+def chain_capture() -> tuple[GoGame, tuple[int, int], str]:
+    """White capturing a black chain of 323 stones filling columns a-q, by taking its last liberty on r19"""
+    stones = {(x, y): "black" for x in range(17) for y in range(19)}
+    stones |= {(17, y): "white" for y in range(18)}
+    return GoGame.from_position(19, 19, stones), (17, 18), "white"
+
+
+def one_eyed_groups() -> tuple[GoGame, tuple[int, int], str]:
+    """
+    The board split into blocks three columns wide, alternately black and white, each block a single group
+    whose only liberty is an eye in its middle column. White captures a black block by filling its eye.
+    """
+    stones = {}
+    for block in range(6):
+        color = "black" if block % 2 == 0 else "white"
+        columns = range(3 * block, 19 if block == 5 else 3 * block + 3)
+        eye = (3 * block + 1, 2 + 3 * block)
+        stones |= {(x, y): color for x in columns for y in range(19) if (x, y) != eye}
+    return GoGame.from_position(19, 19, stones), (13, 14), "white"
+
+
+def long_ko_fight() -> tuple[GoGame, tuple[int, int], str]:
+    """
+    A ko in the corner taken back and forth 76 times under positional superko, with a threat and its answer
+    played between the captures. The next capture is checked against the more than 200 positions seen before.
+    """
+    game = GoGame(19, 19, KoRule.POSITIONAL_SUPERKO)
+    for coord, color in [((1, 0), "black"), ((2, 0), "white"), ((0, 1), "black"), ((3, 1), "white")]:
+        game.place_stone(*coord, color)
+    for coord, color in [((1, 2), "black"), ((2, 2), "white"), ((1, 1), "white")]:
+        game.place_stone(*coord, color)
+    # columns of single colors with empty columns in between, so threats and answers never capture
+    black_moves = iter([(x, y) for x in (6, 10, 14, 18) for y in range(19)])
+    white_moves = iter([(x, y) for x in (8, 12, 16) for y in range(19)] + [(x, y) for y in range(5, 19, 2) for x in range(4)])
+    for _ in range(38):
+        game.place_stone(2, 1, "black")
+        game.place_stone(*next(white_moves), "white")
+        game.place_stone(*next(black_moves), "black")
+        game.place_stone(1, 1, "white")
+        game.place_stone(*next(black_moves), "black")
+        game.place_stone(*next(white_moves), "white")
+    return game, (2, 1), "black"
+
+
+def snake() -> tuple[GoGame, tuple[int, int], str]:
+    """
+    A single black group of 199 stones winding through the board: every other column, joined alternately
+    at the top and the bottom. Black adds a stone in one of the corridors, touching the snake twice.
+    """
+    stones = {(x, y): "black" for x in range(0, 19, 2) for y in range(19)}
+    stones |= {(x, 18 if x % 4 == 1 else 0): "black" for x in range(1, 19, 2)}
+    return GoGame.from_position(19, 19, stones), (9, 9), "black"
+
+
+POSITIONS: dict[str, Position] = {
+    "chain_capture": chain_capture,
+    "one_eyed_groups": one_eyed_groups,
+    "long_ko_fight": long_ko_fight,
+    "snake": snake,
+}
+
+
+def best_time(action: Callable[[], object], setup: Callable[[], object] = lambda: None, rounds: int = 5) -> float:
+    """The fastest of `rounds` runs of `action`, so a single hiccup of the machine does not fail the test"""
+    times = []
+    for _ in range(rounds):
+        setup()
+        start = time.perf_counter()
+        action()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+@pytest.mark.parametrize("position", POSITIONS.values(), ids=POSITIONS.keys())
+class TestPathologicalPositions:
+    def test_place_stone(self, position: Position):
+        game, coord, color = position()
+        forks: list[GoGame] = []
+
+        seconds = best_time(lambda: forks[-1].place_stone(*coord, color), setup=lambda: forks.append(game.fork()))
+
+        assert forks[-1].color_at(*coord) == color
+        assert seconds < PLACE_STONE_CEILING
+
+    def test_check_self_capture(self, position: Position):
+        game, _, _ = position()
+        checks: list[tuple[int, int, list[int], list[int]]] = []
+        for point in range(game.size_x * game.size_y):
+            if game.color_at(*divmod(point, game.size_y)) is not None:
+                continue
+            adjacent_roots = game._adjacent_roots(point)
+            for color in COLOR_CODES.values():
+                in_atari = [root for root in adjacent_roots if game._groups[root].color != color and len(game._groups[root].liberties) == 1]
+                checks.append((point, color, adjacent_roots, in_atari))
+        self_captures = []
+
+        def check_all():
+            self_captures.clear()
+            for args in checks:
+                try:
+                    game._check_self_capture(*args)
+                except SelfCaptureException:
+                    self_captures.append(args[0])
+
+        seconds = best_time(check_all)
+
+        assert self_captures == [point for point, color, *_ in checks if not game.is_legal(*divmod(point, game.size_y), _color_name(color))]
+        assert seconds < SELF_CAPTURE_CEILING
+
+    def test_to_domain(self, position: Position):
+        game, _, _ = position()
+        stored = TelegramGoGame(chat_id=1, board_x=game.size_x, board_y=game.size_y)
+        stored.add_player(1, "white")
+        stored.add_player(2, "black")
+        stored.load_position({(x, y): color for x in range(game.size_x) for y in range(game.size_y) if (color := game.color_at(x, y))})
+        stored.load_history(game.history_bytes())
+        item = to_db_format(stored)
+        loaded: list[TelegramGoGame] = []
+
+        seconds = best_time(lambda: loaded.append(to_domain(item)))
+
+        assert loaded[-1].position_hash == game.position_hash
+        assert len(loaded[-1].undo_stack) == len(game.undo_stack)
+        assert seconds < TO_DOMAIN_CEILING
+
+
+def _color_name(code: int) -> str:
+    return next(name for name, value in COLOR_CODES.items() if value == code)
@@ -1,3 +1,5 @@
+import pytest
+
 from gobot.go.vec2 import Vec2
 
 
@@ -122,3 +124,31 @@ class TestVec2:
     def test_unpack(self):
         point = Vec2(3, 4)
         assert (3, 4) == tuple(point)
+
+    def test_immutable(self):
+        point = Vec2(3, 4)
+        with pytest.raises(AttributeError):
+            point.x = 5  # type: ignore
+
+    def test_hashable(self):
+        assert {Vec2(1, 2): "a"}[Vec2(1, 2)] == "a"
+        assert hash(Vec2(1, 2)) == hash((1, 2))
+
+    def test_not_equal_unsupported_type(self):
+        assert Vec2(1, 1) != 1
+        assert Vec2(1, 2) != "(1, 2)"
+
+    def test_add_unsupported_type(self):
+        with pytest.raises(TypeError):
+            Vec2(1, 2) + "3"  # type: ignore
+
+    def test_array_round_trip(self):
+        numpy = pytest.importorskip("numpy")
+        points = [Vec2(1, 2), Vec2(3.5, 4)]
+
+        array = Vec2.to_array(points)
+
+        assert array.shape == (2, 2)
+        assert Vec2.from_array(array * 2 + 1) == [Vec2(3, 5), Vec2(8, 9)]
+        assert Vec2.to_array([]).shape == (0, 2)
+        assert isinstance(array, numpy.ndarray)
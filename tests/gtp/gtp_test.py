@@ -0,0 +1,76 @@
+import io
+
+from gtp import GtpEngine
+
+
+class TestGtp:
+    @staticmethod
+    def send(engine: GtpEngine, *lines: str) -> list[str]:
+        responses = [engine.handle(line) for line in lines]
+        return [response for response in responses if response is not None]
+
+    def test_protocol_basics(self):
+        engine = GtpEngine()
+        assert self.send(engine, "protocol_version", "7 name", "# comment", "", "known_command genmove", "known_command foo") == [
+            "= 2\n\n",
+            "=7 GoBot\n\n",
+            "= true\n\n",
+            "= false\n\n",
+        ]
+        assert self.send(engine, "foo") == ["? unknown command\n\n"]
+        assert set(engine.handle("list_commands")[2:].split()) >= {"boardsize", "play", "genmove", "undo", "final_score", "showboard"}  # type: ignore
+
+    def test_boardsize(self):
+        engine = GtpEngine()
+        assert self.send(engine, "boardsize 13", "boardsize 10") == ["=\n\n", "? unacceptable size\n\n"]
+        assert engine.game.size_x == 13
+
+    def test_play_maps_vertices(self):
+        engine = GtpEngine()
+        self.send(engine, "boardsize 9", "play b A1", "play w J9", "play b pass", "play w H1")
+        assert engine.game.color_at(0, 8) == "black"
+        assert engine.game.color_at(8, 0) == "white"
+        assert engine.game.color_at(7, 8) == "white"
+        assert engine.game.undo_stack[2].coord is None
+
+    def test_illegal_moves(self):
+        engine = GtpEngine()
+        self.send(engine, "boardsize 9", "play b A1")
+        assert self.send(engine, "play w A1", "play w I5", "play w Z1", "play x A2", "play b") == [
+            "? illegal move\n\n",
+            "? invalid coordinate\n\n",
+            "? invalid coordinate\n\n",
+            "? invalid color\n\n",
+            "? syntax error\n\n",
+        ]
+
+    def test_undo_and_final_score(self):
+        engine = GtpEngine()
+        self.send(engine, "boardsize 9", "komi 0.5", "play b E5", "play w D4")
+        assert self.send(engine, "undo", "final_score") == ["=\n\n", "= B+80.5\n\n"]
+        assert self.send(engine, "undo", "undo") == ["=\n\n", "? cannot undo\n\n"]
+        assert self.send(engine, "final_score") == ["= W+0.5\n\n"]
+
+    def test_genmove(self):
+        engine = GtpEngine(seconds=0.2)
+        self.send(engine, "boardsize 9", "play b E5")
+        [response] = self.send(engine, "genmove w")
+        assert response.startswith("= ")
+        assert len(engine.game.undo_stack) == 2
+        x, y = engine.game.undo_stack[-1].coord  # type: ignore
+        assert response == f"= {'ABCDEFGHJ'[x]}{9 - y}\n\n"
+
+    def test_showboard(self):
+        engine = GtpEngine()
+        self.send(engine, "boardsize 9", "play b A9", "play w J1")
+        board = engine.handle("showboard")
+        assert board is not None
+        assert " 9 X . . . . . . . . 9" in board
+        assert " 1 . . . . . . . . O 1" in board
+
+    def test_run_stops_on_quit(self):
+        engine = GtpEngine()
+        output = io.StringIO()
+        engine.run(io.StringIO("boardsize 9\nquit\nplay b A1\n"), output)
+        assert output.getvalue() == "=\n\n=\n\n"
+        assert engine.game.color_at(0, 8) is None
@@ -65,10 +65,13 @@ def test_start_prints_instructions(mock_send_message):
             "These are my available commands:<br>"
             "  /start - to show this introductory message<br>"
             "  /new - start a new 9x9 game<br>"
+            "  /bot - start a new 9x9 game against me<br>"
             "  /join - join an already created game<br>"
             "  /place <i>coords</i> - play a stone of your color at given coordinates (e.g. <code>/place a1</code>)<br>"
             "  /pass - to skip your turn<br>"
+            "  /undo - take back your last move<br>"
             "  /show - show the current board state<br>"
+            "  /sgf - download the game record as an SGF file<br>"
             "  /proverb - display a proverb"
         ),
         parse_mode="HTML",
@@ -158,6 +161,27 @@ def test_pass_turn(mock_send_message, mock_send_photo):
     mock_send_photo.assert_called_once()
 
 
+def test_pass_twice_reports_result(mock_send_message, mock_send_photo):
+    """Two consecutive passes end the game and report the score"""
+    # Arrange: Start a new game, join and place a single stone
+    initialize_game(mock_send_message, mock_send_photo)
+    main.lambda_handler(build_event("/place e5"), None)
+    mock_send_message.reset_mock()
+
+    # Act: Both players pass
+    main.lambda_handler(build_event("/pass"), None)
+    response = main.lambda_handler(build_event("/pass"), None)
+
+    # Assert
+    assert response == {"statusCode": 200, "body": "Success"}
+    mock_send_message.assert_any_call(
+        ANY,
+        chat_id=DEFAULT_CHAT_ID,
+        text="Black: 81 points\nWhite: 7.5 points (including 7.5 komi)\n<b>Black wins by 73.5 points!</b>",
+        parse_mode="HTML",
+    )
+
+
 def test_new_game_with_board_size(mock_send_message):
     """/new with board size argument starts a game with that size"""
     # Arrange
@@ -179,3 +179,42 @@ class TestRoundTrip:
         assert restored_game.players[1].did_pass == original_game.players[1].did_pass
         assert restored_game.board[10][10].color == PlayerColor.WHITE
         assert restored_game.board[11][11].color == PlayerColor.BLACK
+
+    def test_round_trip_preserves_undo_stack(self):
+        original_game = TelegramGoGame(chat_id=999, board_x=9, board_y=9)
+        original_game.add_player(111, "Alice")
+        original_game.add_player(222, "Bob")
+        for coord in ["b1", "a1", "a2"]:
+            original_game.place_stone_str_coord(coord)
+        assert original_game.board[0][0].is_free
+
+        restored_game = to_domain(to_db_format(original_game))
+        restored_game.undo()
+
+        assert restored_game.board[0][0].color == PlayerColor.WHITE
+        assert restored_game.board[0][1].is_free
+        assert restored_game.last_captured_single_stone is None
+        assert restored_game.last_stone_placed == (0, 0)
+        assert len(restored_game.undo_stack) == 2
+
+        restored_game.undo()
+        restored_game.undo()
+        assert all(grid_pos.is_free for column in restored_game.board for grid_pos in column)
+        assert restored_game.position_hash == TelegramGoGame(chat_id=999, board_x=9, board_y=9).position_hash
+
+    def test_round_trip_preserves_history(self):
+        original_game = TelegramGoGame(chat_id=999, board_x=9, board_y=9)
+        original_game.add_player(111, "Alice")
+        original_game.add_player(222, "Bob")
+        for coord in ["b1", "a1", "a2"]:
+            original_game.place_stone_str_coord(coord)
+        original_game.pass_turn()
+
+        db_format = to_db_format(original_game)
+        restored_game = to_domain(db_format)
+
+        assert isinstance(db_format["history"], bytes)
+        assert len(db_format["history"]) == 2 * 5
+        assert restored_game.history == original_game.history
+        assert restored_game.undo_stack[-1].coord is None
+        assert restored_game.undo_stack[-2].captured == [(0, 0)]
@@ -0,0 +1,165 @@
+from unittest.mock import patch
+
+import pytest
+
+from gobot import settings
+from gobot.go.mcts import MCTS
+from gobot.persistence import persistence_factory
+from gobot.telegram.gamehandler import GameHandler, GameHandlerException
+from gobot.telegram.player import BOT_PLAYER_ID, BOT_PLAYER_NAME
+from gobot.telegram.player_color import PlayerColor
+from tests.fake_db import FakeDB
+
+CHAT_ID = 123456
+USER_ID = 111111
+USERNAME = "Alice"
+
+
+@pytest.fixture
+def fake_db():
+    db = FakeDB()
+    with (
+        patch.object(settings, "_settings", settings.Settings(TOKEN="123456:fake", BOT_THINKING_SECONDS=0.05)),
+        patch.object(persistence_factory, "get_db_adapter", lambda: db),
+    ):
+        yield db
+
+
+@pytest.fixture
+def handler(fake_db):
+    handler = GameHandler()
+    yield handler
+    handler.remove_game(CHAT_ID)
+
+
+class TestBotGame:
+    def test_new_game_against_bot_lets_player_move_first(self, handler):
+        game = handler.new_game(CHAT_ID, USER_ID, USERNAME, against_bot=True)
+
+        assert [(player.id_, player.name, player.color) for player in game.players] == [
+            (BOT_PLAYER_ID, BOT_PLAYER_NAME, PlayerColor.WHITE),
+            (USER_ID, USERNAME, PlayerColor.BLACK),
+        ]
+        assert game.has_enough_players()
+        assert game.current_player is not None and game.current_player.id_ == USER_ID
+        assert not game.is_bot_turn
+
+    def test_play_bot_move(self, handler, fake_db):
+        handler.new_game(CHAT_ID, USER_ID, USERNAME, against_bot=True)
+        handler.place_stone(CHAT_ID, USER_ID, "E5")
+
+        game, move = handler.play_bot_move(CHAT_ID)
+
+        assert move is not None
+        assert game.color_at(*move) == PlayerColor.WHITE
+        assert not game.is_bot_turn
+        stored = fake_db.load_game(CHAT_ID)
+        assert stored is not None
+        assert [(entry.coord, entry.color) for entry in stored.undo_stack] == [((4, 4), PlayerColor.BLACK), (move, PlayerColor.WHITE)]
+
+    def test_play_bot_move_keeps_changes_made_during_search(self, handler, fake_db):
+        handler.new_game(CHAT_ID, USER_ID, USERNAME, against_bot=True)
+        handler.place_stone(CHAT_ID, USER_ID, "E5")
+        search = MCTS.search
+
+        def search_while_player_undoes(self, *args, **kwargs):
+            handler.undo(CHAT_ID, USER_ID)
+            return search(self, *args, **kwargs)
+
+        with patch.object(MCTS, "search", search_while_player_undoes), pytest.raises(GameHandlerException):
+            handler.play_bot_move(CHAT_ID)
+
+        stored = fake_db.load_game(CHAT_ID)
+        assert stored is not None
+        assert not stored.undo_stack
+        assert not stored.is_bot_turn
+
+    def test_play_bot_move_on_player_turn(self, handler):
+        handler.new_game(CHAT_ID, USER_ID, USERNAME, against_bot=True)
+
+        with pytest.raises(GameHandlerException):
+            handler.play_bot_move(CHAT_ID)
+
+    def test_bot_passes_after_player_pass_when_ahead(self, handler):
+        # on the empty board white is ahead by komi
+        handler.new_game(CHAT_ID, USER_ID, USERNAME, against_bot=True)
+        handler.pass_turn(CHAT_ID, USER_ID)
+
+        with patch.object(MCTS, "search", side_effect=AssertionError("the bot should not search")):
+            game, move = handler.play_bot_move(CHAT_ID)
+
+        assert move is None
+        assert game.is_game_over
+
+    def test_bot_plays_on_after_player_pass_when_behind(self, handler, fake_db):
+        game = handler.new_game(CHAT_ID, USER_ID, USERNAME, against_bot=True)
+        game.load_position({(x, y): PlayerColor.BLACK for x in range(9) for y in range(3)})
+        fake_db.update_game(game)
+        handler.pass_turn(CHAT_ID, USER_ID)
+
+        game, move = handler.play_bot_move(CHAT_ID)
+
+        assert move is not None
+        assert not game.is_game_over
+
+    def test_undo_takes_back_bot_reply_with_player_move(self, handler):
+        handler.new_game(CHAT_ID, USER_ID, USERNAME, against_bot=True)
+        handler.place_stone(CHAT_ID, USER_ID, "E5")
+        handler.play_bot_move(CHAT_ID)
+
+        game = handler.undo(CHAT_ID, USER_ID)
+
+        assert not game.undo_stack
+        assert game.color_at(4, 4) is None
+        assert game.current_player is not None and game.current_player.id_ == USER_ID
+
+
+class TestUndo:
+    OPPONENT_ID = 222222
+
+    def setup_game(self, handler) -> None:
+        """A game between two people, the one who joined plays black and moves first"""
+        handler.new_game(CHAT_ID, self.OPPONENT_ID, "Bob")
+        handler.join(CHAT_ID, USER_ID, USERNAME)
+
+    def test_undo_own_move(self, handler):
+        self.setup_game(handler)
+        handler.place_stone(CHAT_ID, USER_ID, "E5")
+
+        game = handler.undo(CHAT_ID, USER_ID)
+
+        assert not game.undo_stack
+        assert game.current_player is not None and game.current_player.id_ == USER_ID
+
+    def test_undo_own_pass(self, handler):
+        self.setup_game(handler)
+        handler.pass_turn(CHAT_ID, USER_ID)
+
+        game = handler.undo(CHAT_ID, USER_ID)
+
+        assert not game.undo_stack
+        assert not any(player.did_pass for player in game.players)
+        assert game.current_player is not None and game.current_player.id_ == USER_ID
+
+    def test_undo_after_opponent_replied(self, handler, fake_db):
+        self.setup_game(handler)
+        handler.place_stone(CHAT_ID, USER_ID, "E5")
+        handler.place_stone(CHAT_ID, self.OPPONENT_ID, "D4")
+
+        with pytest.raises(GameHandlerException):
+            handler.undo(CHAT_ID, USER_ID)
+        stored = fake_db.load_game(CHAT_ID)
+        assert stored is not None and len(stored.undo_stack) == 2
+
+    def test_undo_opponent_move(self, handler):
+        self.setup_game(handler)
+        handler.place_stone(CHAT_ID, USER_ID, "E5")
+
+        with pytest.raises(GameHandlerException):
+            handler.undo(CHAT_ID, self.OPPONENT_ID)
+
+    def test_undo_without_moves(self, handler):
+        self.setup_game(handler)
+
+        with pytest.raises(GameHandlerException):
+            handler.undo(CHAT_ID, USER_ID)
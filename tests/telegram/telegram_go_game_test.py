@@ -1,6 +1,8 @@
 import os
 
+from gobot.go.go import GoGame
 from gobot.telegram.gamehandler import TelegramGoGame
+from gobot.telegram.player import BOT_PLAYER_ID, BOT_PLAYER_NAME
 from gobot.telegram.player_color import PlayerColor
 
 os.environ["DB"] = "0"
@@ -62,6 +64,20 @@ class TestGame:
         assert not game.players[1].did_pass
         assert game.players[1].color == PlayerColor.BLACK
 
+    def test_bot_game_turns(self):
+        # Arrange
+        game = TelegramGoGame(DEFAULT_CHAT_ID, 9, 9)
+        game.add_player(BOT_PLAYER_ID, BOT_PLAYER_NAME)
+        game.add_player(FIRST_USER_ID, FIRST_USERNAME)
+        # Act & Assert
+        assert game.has_bot
+        assert game.players[0].is_bot
+        assert game.players[0].color == PlayerColor.WHITE
+        assert not game.is_bot_turn
+        game.place_stone_str_coord("a1")
+        assert game.is_bot_turn
+        assert not self.setup_game().has_bot
+
     def test_place_stone(self):
         # Arrange
         game = self.setup_game()
@@ -89,3 +105,37 @@ class TestGame:
         game.pass_turn()
         # Assert
         assert game.is_game_over
+
+    def test_undo(self):
+        # Arrange
+        game = self.setup_game()
+        game.place_stone_str_coord("a1")
+        # Act
+        game.undo()
+        # Assert
+        assert game.board[0][0].is_free
+        assert game.current_player_index == 1
+        assert game.current_player is not None
+        assert game.current_player.color == "black"
+
+    def test_fork_returns_plain_game(self):
+        # Arrange
+        game = self.setup_game()
+        game.place_stone_str_coord("a1")
+        # Act
+        fork = game.fork()
+        # Assert
+        assert type(fork) is GoGame
+        assert fork.board[0][0].color == "black"
+
+    def test_undo_pass(self):
+        # Arrange
+        game = self.setup_game()
+        game.pass_turn()
+        # Act
+        game.undo()
+        # Assert
+        assert game.current_player_index == 1
+        assert game.current_player is not None
+        assert not game.current_player.did_pass
+        assert not game.undo_stack